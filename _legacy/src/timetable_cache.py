@@ -1,13 +1,35 @@
+import atexit
 import datetime
 import json
 import logging
+import mmap
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Union
 
-from src.timetables_client import Timetable, TimetableStop
+import msgpack
+try:
+    # orjson parses the former JSON hour files faster; stdlib json, which also accepts bytes, is the fallback
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from src.timetables_client import Timetable, TimetableStop, parse_db_time
+
+# Dirty hour buckets are written to disk at most once per interval (and on exit)
+FLUSH_INTERVAL_SECONDS = 5.0
+# Hour files at least this large are unpacked from a memory map instead of a read() copy
+MMAP_MIN_FILE_SIZE = 16384
+# Hour buckets are loaded and written concurrently by this many threads
+PERSIST_WORKERS = 4
 
 
 class TimetableCacheStop:
+    # one instance per cached stop and loaded hour bucket, so skip the per-instance __dict__
+    __slots__ = ("timetable_planned", "timetable_changes")
 
     def __init__(self, timetable_planned: Union[TimetableStop, None] = None, timetable_changes: list = None):
         self.timetable_planned = timetable_planned
@@ -24,11 +46,24 @@ class TimetableCache:
     Every station has its own directory it contains:
     - one dir per day with a
     - one _stats.json file with some statistics TimetableCacheStationStats
+
+    Writes are debounced: modified hour buckets are kept in memory as dirty and written
+    by flush(), which runs at most every FLUSH_INTERVAL_SECONDS and on interpreter exit.
     """
 
     def __init__(self, location: str = ''):
         self.location = location
         self.change_count = 0
+        # (eva_no, YYYYMMDD, hour) -> (date, stops) of hour buckets not yet written to disk
+        self._dirty: dict[tuple[str, str, int], tuple[datetime.datetime, list[TimetableCacheStop]]] = {}
+        self._last_flush = time.monotonic()
+        # (eva_no, YYYYMMDD, hour) -> [lock, users] of hour buckets in use, so concurrent ingests never touch the
+        # same bucket at once; an entry is dropped when its last user releases it
+        self._bucket_locks: dict[tuple[str, str, int], list] = {}
+        self._bucket_locks_guard = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=PERSIST_WORKERS, thread_name_prefix="timetable_cache")
+        # the executor does not accept work anymore when atexit handlers run
+        atexit.register(self.flush, parallel=False)
 
     def add_timetable_planned(self, timetable_planned: Timetable):
         eva_no = timetable_planned.eva
@@ -38,30 +73,46 @@ class TimetableCache:
         if not timetable_planned.s:
             logging.info(msg=f"No planned timetable stored for {eva_no}, because no stops found")
             return
-        # Gruppiere alle Stops nach Stunde
+        eva_str = str(eva_no)
+        eva_dir = os.path.join(self.location, eva_str)
+        # Gruppiere alle Stops nach Tag und Stunde (YYMMddHH-Präfix der geplanten Zeit)
         stops_by_hour = {}
         for stop in timetable_planned.s:
             stop_time_str = get_planned_time(stop)
             if not stop_time_str:
                 continue
-            stop_time = datetime.datetime.strptime(stop_time_str, "%y%m%d%H%M")
-            hour = stop_time.hour
-            stops_by_hour.setdefault(hour, []).append(stop)
-        # Für jede Stunde: Cache laden, Stops einfügen, speichern
-        for hour, stops in stops_by_hour.items():
-            # Nimm das Datum vom ersten Stop dieser Stunde
-            date_str = get_planned_time(stops[0])
-            date = datetime.datetime.strptime(date_str, "%y%m%d%H%M")
-            already_cached_stops = self.load_cached_stops(self.location, str(eva_no), date)
-            stats = self.load_station_stats(self.location, str(eva_no))
+            stops_by_hour.setdefault(stop_time_str[:8], []).append(stop)
+        # Für jede Stunde: Cache laden, Stops einfügen, speichern (Stunden parallel)
+        for _ in self._executor.map(
+                lambda item: self._merge_planned_hour(eva_str, eva_dir, parse_db_time(item[0] + "00"), item[1]),
+                stops_by_hour.items()):
+            pass
+        self._maybe_flush()
+
+    def _merge_planned_hour(self, eva_no: str, eva_dir: str, date: datetime.datetime, stops: list[TimetableStop]):
+        """
+        Merges the planned stops of one hour bucket into its cached stops and marks the bucket dirty if any stop
+        was added or modified; unchanged buckets (e.g. overlapping fetch windows) are neither serialized nor written again
+        The bucket is locked from loading until it is marked dirty
+        """
+        with self._locked_buckets([self._bucket_key(eva_no, date)]):
+            already_cached_stops = self._get_cached_stops(eva_no, date, eva_dir)
+            cached_by_id = {s.timetable_planned.id: s for s in already_cached_stops if s.timetable_planned}
+            changed = False
             for new_stop in stops:
                 # Check if stop already exists in cache (same id)
-                existing_stop = next((s for s in already_cached_stops if s.timetable_planned and s.timetable_planned.id == new_stop.id), None)
+                existing_stop = cached_by_id.get(new_stop.id)
                 if existing_stop:
-                    existing_stop.timetable_planned = new_stop
+                    if existing_stop.timetable_planned != new_stop:
+                        existing_stop.timetable_planned = new_stop
+                        changed = True
                 else:
-                    already_cached_stops.append(TimetableCacheStop(timetable_planned=new_stop))
-            self.save_cached_stops(self.location, str(eva_no), date, already_cached_stops)
+                    cache_stop = TimetableCacheStop(timetable_planned=new_stop)
+                    already_cached_stops.append(cache_stop)
+                    cached_by_id[new_stop.id] = cache_stop
+                    changed = True
+            if changed:
+                self._mark_dirty(eva_no, date, already_cached_stops)
 
     def add_timetable_change(self, timetable_changes: Timetable):
         """
@@ -82,157 +133,404 @@ class TimetableCache:
         if not timetable_changes.s:
             logging.info(msg=f"No changed timetable stored for {eva_no}, because no stops found")
             return
-        eva_cache_dir = os.path.join(self.location, str(eva_no))
-        if not os.path.isdir(eva_cache_dir):
+        eva_str = str(eva_no)
+        eva_cache_dir = os.path.join(self.location, eva_str)
+        has_pending = any(dirty_eva == eva_str for dirty_eva, _, _ in self._dirty)
+        if not has_pending and not os.path.isdir(eva_cache_dir):
             logging.warning(msg=f"Location {eva_cache_dir} is not a directory, cannot cache changed timetable")
             return
 
-        stats = self.load_station_stats(self.location, str(eva_no))
-        tmp_hourly_cache = {}
+        stats = self.load_station_stats(self.location, eva_str)
+        # (YYMMddHH of the planned time, change) of every change that can be sorted into an hour bucket
+        dated_changes = []
         for change in timetable_changes.s:
             date_str = get_planned_time(change)
             if not date_str:
                 logging.warning(msg=f"No planned time in changed timetable stop {change.id}, cannot cache")
                 continue
-            date = datetime.datetime.strptime(date_str, "%y%m%d%H%M")
-            if date.hour not in tmp_hourly_cache:
-                tmp_hourly_cache[date.hour] = self.load_cached_stops(self.location, str(eva_no), date)
-            for cached_stop in tmp_hourly_cache[date.hour]:
-                if cached_stop.timetable_planned and cached_stop.timetable_planned.id == change.id:
+            dated_changes.append((date_str[:8], change))
+        hour_dates = {hour_key: parse_db_time(hour_key + "00") for hour_key, _ in dated_changes}
+
+        # the buckets stay locked until the changes are appended, so a concurrent flush either writes a bucket
+        # with the changes already in memory or runs after the sidecar append, never both
+        with self._locked_buckets([self._bucket_key(eva_str, date) for date in hour_dates.values()]):
+            hours_loaded = set()
+            # stop id -> (YYMMddHH of the bucket the stop is cached in, cached stop), filled as hours are loaded
+            cached_by_id = {}
+            changes_by_hour = {}
+            for hour_key, change in dated_changes:
+                if hour_key not in hours_loaded:
+                    hours_loaded.add(hour_key)
+                    for s in self._get_cached_stops(eva_str, hour_dates[hour_key], eva_cache_dir):
+                        if s.timetable_planned:
+                            cached_by_id[s.timetable_planned.id] = (hour_key, s)
+                target = cached_by_id.get(change.id)
+                if target:
+                    stop_hour_key, cached_stop = target
+                    # keeps a not yet flushed bucket up to date, the change itself is persisted by the append below
                     cached_stop.add_timetable_change(change)
+                    changes_by_hour.setdefault(stop_hour_key, []).append(change)
                     stats.change_count += 1
-                    break
-        for hour, stops in tmp_hourly_cache.items():
-            if stops and stops[0].timetable_planned:
-                date_str = get_planned_time(stops[0].timetable_planned)
-                if date_str:
-                    date = datetime.datetime.strptime(date_str, "%y%m%d%H%M").replace(hour=hour)
-                    self.save_cached_stops(self.location, str(eva_no), date, stops)
+            for hour_key, changes in changes_by_hour.items():
+                self.save_changes_append(self.location, eva_str, hour_dates[hour_key], changes, eva_cache_dir)
+        if changes_by_hour:
+            self.save_station_stats(self.location, eva_str, stats)
+        self._maybe_flush()
+
+    def flush(self, parallel: bool = True):
+        """
+        Writes all dirty hour buckets to disk
+        Every bucket is written and synced to a temporary file first, which then replaces the hour file,
+        so a crash never leaves a truncated hour file; each touched day directory is synced once afterwards
+        to make the renames durable
+        :param parallel: write the buckets concurrently on the cache's thread pool
+        :return: None
+        """
+        # the buckets are taken out of the dirty set only once they are locked, so no ingest can modify
+        # a bucket between being taken out and being written
+        keys = list(self._dirty)
+        with self._locked_buckets(keys):
+            dirty = {key: self._dirty.pop(key) for key in keys if key in self._dirty}
+            eva_dirs = {eva_no: os.path.join(self.location, eva_no) for eva_no, _, _ in dirty}
+            if parallel:
+                tmp_files = list(self._executor.map(
+                    lambda item: self._write_bucket_tmp(eva_dirs[item[0][0]], item), dirty.items()))
+            else:
+                tmp_files = [self._write_bucket_tmp(eva_dirs[item[0][0]], item) for item in dirty.items()]
+            day_dirs = set()
+            for ((eva_no, _, _), (date, _)), tmp_file in zip(dirty.items(), tmp_files):
+                if tmp_file:
+                    self.replace_cached_stops(self.location, eva_no, date, tmp_file, eva_dirs[eva_no])
+                    day_dirs.add(cache_hour_dir(eva_dirs[eva_no], date))
+            for day_dir in day_dirs:
+                _fsync_dir(day_dir)
+        self._update_planned_cache_end(dirty)
+        self._last_flush = time.monotonic()
+
+    def _write_bucket_tmp(self, eva_dir: str, item: tuple[tuple[str, str, int], tuple[datetime.datetime, list[TimetableCacheStop]]]) \
+            -> Union[str, None]:
+        (eva_no, _, _), (date, stops) = item
+        return self.write_cached_stops_tmp(self.location, eva_no, date, stops, eva_dir=eva_dir)
+
+    def _update_planned_cache_end(self, written: dict[tuple[str, str, int], tuple[datetime.datetime, list[TimetableCacheStop]]]):
+        """
+        Advances the planned_cache_end watermark in _stats.json of every station with written hour buckets
+        """
+        written_end = {}
+        for (eva_no, _, _), (date, _) in written.items():
+            if eva_no not in written_end or date > written_end[eva_no]:
+                written_end[eva_no] = date
+        for eva_no, end in written_end.items():
+            end = end.replace(minute=0, second=0, microsecond=0)
+            stats = self.load_station_stats(self.location, eva_no)
+            if stats.planned_cache_end is None:
+                stats.planned_cache_end = self._scan_planned_cache_time_end(eva_no)
+            if stats.planned_cache_end is None or end > stats.planned_cache_end:
+                stats.planned_cache_end = end
+            self.save_station_stats(self.location, eva_no, stats)
+
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    @contextmanager
+    def _locked_buckets(self, keys: list[tuple[str, str, int]]):
+        """
+        Holds the locks of the given hour buckets, acquired in sorted order so that callers never deadlock
+        """
+        keys = sorted(set(keys))
+        with self._bucket_locks_guard:
+            entries = [self._bucket_locks.setdefault(key, [threading.Lock(), 0]) for key in keys]
+            for entry in entries:
+                entry[1] += 1
+        for lock, _ in entries:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock, _ in entries:
+                lock.release()
+            with self._bucket_locks_guard:
+                for key, entry in zip(keys, entries):
+                    entry[1] -= 1
+                    if not entry[1]:
+                        del self._bucket_locks[key]
+
+    @staticmethod
+    def _bucket_key(eva_no: str, date: datetime.datetime) -> tuple[str, str, int]:
+        return eva_no, format_cache_day(date), date.hour
+
+    def _mark_dirty(self, eva_no: str, date: datetime.datetime, stops: list[TimetableCacheStop]):
+        self._dirty[self._bucket_key(eva_no, date)] = (date, stops)
+
+    def _get_cached_stops(self, eva_no: str, date: datetime.datetime, eva_dir: str) -> list[TimetableCacheStop]:
+        """
+        Returns the stops of an hour bucket, preferring the not yet flushed in-memory version
+        :param eva_dir: location/eva_no directory, joined once by the caller
+        """
+        dirty = self._dirty.get(self._bucket_key(eva_no, date))
+        if dirty is not None:
+            return dirty[1]
+        return self.load_cached_stops(self.location, eva_no, date, eva_dir)
 
     def get_planned_cache_time_end(self, eva_no) -> datetime.datetime:
         """
         Returns the newest planned time in the cache
+        The time is read from the planned_cache_end watermark in _stats.json, which flush() keeps up to date
         If no planned timetable is in the cache, returns the current time
         :return: datetime
         """
+        eva_str = str(eva_no)
+        # Hour buckets that are not flushed yet are part of the cache as well
+        pending = [date for (dirty_eva, _, _), (date, _) in self._dirty.items() if dirty_eva == eva_str]
+        pending_end = max(pending).replace(minute=0, second=0, microsecond=0) if pending else None
+
+        latest_time = self.load_station_stats(self.location, eva_str).planned_cache_end
+        if latest_time is None:
+            # cache written before the watermark existed
+            latest_time = self._scan_planned_cache_time_end(eva_str)
+        if pending_end and (latest_time is None or pending_end > latest_time):
+            latest_time = pending_end
+        if latest_time is None:
+            logging.info(msg=f"No planned timetable found in cache for {eva_no}, returning current time")
+            return datetime.datetime.now()
+        logging.info(msg=f"Found planned cache end time for {eva_no}: {latest_time}")
+        return latest_time
+
+    def _scan_planned_cache_time_end(self, eva_no: str) -> Union[datetime.datetime, None]:
+        """
+        Finds the newest planned hour file by walking the cache directory of a station
+        :return: datetime or None if there is no hour file
+        """
         if not os.path.isdir(self.location):
             logging.warning(msg=f"Location {self.location} is not a directory, cannot get planned cache time end")
-            return datetime.datetime.now()
+            return None
 
-        eva_cache_dir = os.path.join(self.location, str(eva_no))
+        eva_cache_dir = os.path.join(self.location, eva_no)
         if not os.path.isdir(eva_cache_dir):
             logging.info(msg=f"No cache directory for {eva_no}, cannot get planned cache time end")
-            return datetime.datetime.now()
-
-        latest_time = datetime.datetime.min
-        latest_day_dir = None
-        for day_dir in os.listdir(eva_cache_dir):
-            day_path = os.path.join(self.location, str(eva_no), day_dir)
-            if not os.path.isdir(day_path):
-                continue
-            if datetime.datetime.strptime(day_dir, "%y%m%d") > latest_time:
-                latest_time = datetime.datetime.strptime(day_dir, "%y%m%d")
-                latest_day_dir = day_path
-
-        if not latest_day_dir:
-            logging.info(msg=f"No planned timetable found in cache for {eva_no}, returning current time")
-            return datetime.datetime.now()
-
-        for hour_file in os.listdir(latest_day_dir):
-            if not hour_file.endswith(".json"):
-                continue
-            hour = int(hour_file.replace(".json", ""))
-            file_time = latest_time.replace(hour=hour)
-            if file_time > latest_time:
-                latest_time = file_time
-
-        if latest_time == datetime.datetime.min:
-            logging.info(msg=f"No planned timetable found in cache for {eva_no}, returning current time")
-            return datetime.datetime.now()
-        logging.info(msg="Found planned cache end time for {eva_no}: {latest_time}")
-        return latest_time
+            return None
+
+        # Day directories are named YYYYMMDD, the newest one is found in a single pass
+        # (scandir answers is_dir/is_file from the directory entry, without an extra stat per entry)
+        with os.scandir(eva_cache_dir) as entries:
+            day_dirs = [entry for entry in entries if len(entry.name) == 8 and entry.name.isdigit() and entry.is_dir()]
+        if not day_dirs:
+            return None
+        latest_day_dir = max(day_dirs, key=lambda entry: entry.name)
+        latest_day = latest_day_dir.name
+
+        # hour files are HH.msgpack (or HH.json before conversion), sidecars and temporary files have more suffixes
+        with os.scandir(latest_day_dir.path) as entries:
+            hour_files = [entry.name.partition(".") for entry in entries if entry.is_file()]
+        latest_hour = max((int(hour) for hour, _, suffix in hour_files if suffix in ("msgpack", "json") and hour.isdigit()),
+                          default=0)
+        return datetime.datetime(int(latest_day[0:4]), int(latest_day[4:6]), int(latest_day[6:8]), latest_hour)
 
     @staticmethod
-    def load_cached_stops(location: str, eva_no: str, date: datetime.datetime) -> list[TimetableCacheStop]:
+    def load_cached_stops(location: str, eva_no: str, date: datetime.datetime,
+                          eva_dir: Union[str, None] = None) -> list[TimetableCacheStop]:
         """
-        Loads the list of TimetableCacheStop of an specific hour from a json file
-        The file is stored in location/eva_no/YYYYMMDD/HH.json
+        Loads the list of TimetableCacheStop of an specific hour from a msgpack file
+        The file is stored in location/eva_no/YYYYMMDD/HH.msgpack, changes appended to
+        location/eva_no/YYYYMMDD/HH.changes.msgpack are attached to their planned stop
+        Hour files of the former JSON format (HH.json, HH.changes.jsonl) are converted on first load
         If the file does not exist, returns an empty list
         """
-        assert os.path.isdir(location), f"Location {location} is not a directory"
         assert isinstance(date, datetime.datetime), f"Date {date} is not a datetime"
         assert isinstance(eva_no, str), f"Eva number {eva_no} is not a string"
 
-        cache_dir = os.path.join(location, str(eva_no), date.strftime('%Y%m%d'))
-        cache_file = os.path.join(cache_dir, f"{date.hour}.json")
-        if not os.path.isfile(cache_file):
-            return []  # No cache file found
+        cache_dir = cache_hour_dir(eva_dir or os.path.join(location, eva_no), date)
+        cache_file = os.path.join(cache_dir, f"{date.hour}.msgpack")
 
         # load the cache file and return the list of TimetableCacheStop
-        with open(cache_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        stops = []
-        for stop_dict in data:
-            planned = TimetableStop(**stop_dict.get("timetable_planned")) if stop_dict.get(
-                "timetable_planned") else None
-            changes = [TimetableStop(**c) for c in stop_dict.get("timetable_changes", [])]
-            stops.append(TimetableCacheStop(timetable_planned=planned, timetable_changes=changes))
+        try:
+            with open(cache_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size < MMAP_MIN_FILE_SIZE:
+                    data = msgpack.unpackb(f.read())
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        data = msgpack.unpackb(view)
+        except FileNotFoundError:
+            return TimetableCache._migrate_json_stops(location, eva_no, date, eva_dir)
+
+        stops, stops_by_id = _build_cache_stops(data)
+        # attach the changes appended since the hour file was last written
+        try:
+            with open(os.path.join(cache_dir, f"{date.hour}.changes.msgpack"), "rb") as f:
+                for entry in msgpack.Unpacker(f):
+                    stop = stops_by_id.get(entry["id"])
+                    if stop:
+                        stop.timetable_changes.append(TimetableStop(**entry["change"]))
+        except FileNotFoundError:
+            pass
+        return stops
+
+    @staticmethod
+    def _migrate_json_stops(location: str, eva_no: str, date: datetime.datetime,
+                            eva_dir: Union[str, None] = None) -> list[TimetableCacheStop]:
+        """
+        Loads an hour bucket stored in the former JSON format and rewrites it as msgpack
+        :return: the stops or an empty list if there is no JSON hour file either
+        """
+        cache_dir = cache_hour_dir(eva_dir or os.path.join(location, eva_no), date)
+        json_file = os.path.join(cache_dir, f"{date.hour}.json")
+        changes_file = os.path.join(cache_dir, f"{date.hour}.changes.jsonl")
+        try:
+            with open(json_file, "rb") as f:
+                data = json_loads(f.read())
+        except FileNotFoundError:
+            return []  # No cache file found
+
+        stops, stops_by_id = _build_cache_stops(data)
+        try:
+            with open(changes_file, "rb") as f:
+                for line in f:
+                    entry = json_loads(line)
+                    stop = stops_by_id.get(entry["id"])
+                    if stop:
+                        stop.timetable_changes.append(TimetableStop(**entry["change"]))
+        except FileNotFoundError:
+            pass
+
+        TimetableCache.save_cached_stops(location, eva_no, date, stops, eva_dir)
+        for legacy_file in (json_file, changes_file):
+            try:
+                os.remove(legacy_file)
+            except FileNotFoundError:
+                pass
+        logging.info(msg=f"Converted cached hour {date.hour} of {eva_no} on {format_cache_day(date)} to msgpack")
         return stops
 
     @staticmethod
-    def save_cached_stops(location: str, eva_no: str, date: datetime.datetime, stops: list[TimetableCacheStop]):
+    def save_cached_stops(location: str, eva_no: str, date: datetime.datetime, stops: list[TimetableCacheStop],
+                          eva_dir: Union[str, None] = None):
         """
-        Saves the list of TimetableCacheStop of an specific hour to a json file
-        The file is stored in location/eva_no/YYYYMMDD/HH.json
+        Saves the list of TimetableCacheStop of an specific hour to a msgpack file
+        The file is stored in location/eva_no/YYYYMMDD/HH.msgpack and replaced atomically
+        """
+        tmp_file = TimetableCache.write_cached_stops_tmp(location, eva_no, date, stops, eva_dir=eva_dir)
+        if tmp_file:
+            TimetableCache.replace_cached_stops(location, eva_no, date, tmp_file, eva_dir)
+            _fsync_dir(cache_hour_dir(eva_dir or os.path.join(location, eva_no), date))
+
+    @staticmethod
+    def write_cached_stops_tmp(location: str, eva_no: str, date: datetime.datetime, stops: list[TimetableCacheStop],
+                               sync: bool = True, eva_dir: Union[str, None] = None) -> Union[str, None]:
+        """
+        Writes the list of TimetableCacheStop of an specific hour to location/eva_no/YYYYMMDD/HH.msgpack.tmp
+        :param sync: flush the file to the disk before returning
+        :param eva_dir: precomputed location/eva_no directory, joined from location and eva_no if not given
+        :return: path of the temporary file or None if the stops could not be serialized
         """
-        assert os.path.isdir(location), f"Location {location} is not a directory"
         assert isinstance(date, datetime.datetime), f"Date {date} is not a datetime"
         assert isinstance(eva_no, str), f"Eva number {eva_no} is not a string"
 
-        cache_dir = os.path.join(location, str(eva_no), date.strftime('%Y%m%d'))
-        if not os.path.isdir(cache_dir):
-            os.makedirs(cache_dir, exist_ok=True)
-            logging.info(msg=f"Created cache directory for {eva_no} on {date.strftime('%Y%m%d')}")
+        cache_dir = cache_hour_dir(eva_dir or os.path.join(location, eva_no), date)
+        os.makedirs(cache_dir, exist_ok=True)
 
-        cache_file = os.path.join(cache_dir, f"{date.hour}.json")
-        # Serialisiere zuerst in einen String, um unvollständige Dateien zu vermeiden
+        tmp_file = os.path.join(cache_dir, f"{date.hour}.msgpack.tmp")
+        # Serialisiere zuerst in Bytes, um unvollständige Dateien zu vermeiden
         try:
-            serializable_data = [{
+            packed = msgpack.packb([{
                 "timetable_planned": stop.timetable_planned.model_dump(mode="json", exclude_none=True) if stop.timetable_planned else None,
                 "timetable_changes": [c.model_dump(mode="json", exclude_none=True) for c in stop.timetable_changes]
-            } for stop in stops]
-            json_str = json.dumps(serializable_data, ensure_ascii=False, indent=4)
+            } for stop in stops])
         except Exception as e:
             logging.error(f"Error serializing TimetableCacheStop for eva_no={eva_no}, date={date}: {e}")
+            return None
+        with open(tmp_file, "wb") as f:
+            f.write(packed)
+            if sync:
+                f.flush()
+                _fdatasync(f.fileno())
+        return tmp_file
+
+    @staticmethod
+    def replace_cached_stops(location: str, eva_no: str, date: datetime.datetime, tmp_file: str,
+                             eva_dir: Union[str, None] = None):
+        """
+        Atomically replaces the hour file with a temporary file written by write_cached_stops_tmp
+        """
+        cache_dir = cache_hour_dir(eva_dir or os.path.join(location, eva_no), date)
+        os.replace(tmp_file, os.path.join(cache_dir, f"{date.hour}.msgpack"))
+        # the changes sidecar is fully contained in the rewritten hour file now
+        try:
+            os.remove(os.path.join(cache_dir, f"{date.hour}.changes.msgpack"))
+        except FileNotFoundError:
+            pass
+        logging.info(msg=f"Cached planned timetable for {eva_no} on {format_cache_day(date)}")
+
+    @staticmethod
+    def save_changes_append(location: str, eva_no: str, date: datetime.datetime, changes: list[TimetableStop],
+                            eva_dir: Union[str, None] = None):
+        """
+        Appends changes of an specific hour to the changes sidecar of the hour file
+        The file is stored in location/eva_no/YYYYMMDD/HH.changes.msgpack, a stream of {"id", "change"} maps
+        It is merged into the hour file the next time that file is rewritten
+        """
+        assert isinstance(date, datetime.datetime), f"Date {date} is not a datetime"
+        assert isinstance(eva_no, str), f"Eva number {eva_no} is not a string"
+
+        cache_dir = cache_hour_dir(eva_dir or os.path.join(location, eva_no), date)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        try:
+            packed = b"".join(msgpack.packb({"id": c.id, "change": c.model_dump(mode="json", exclude_none=True)}) for c in changes)
+        except Exception as e:
+            logging.error(f"Error serializing changes for eva_no={eva_no}, date={date}: {e}")
             return
-        with open(cache_file, "w", encoding="utf-8") as f:
-            f.write(json_str)
-        logging.info(msg=f"Cached planned timetable for {eva_no} on {date.strftime('%Y%m%d')}")
+        with open(os.path.join(cache_dir, f"{date.hour}.changes.msgpack"), "ab") as f:
+            f.write(packed)
+        logging.info(msg=f"Cached {len(changes)} changes for {eva_no} on {format_cache_day(date)} {date.hour}h")
 
     @staticmethod
     def load_station_stats(location, eva_no):
         """
         Loads the station stats from the _stats.json file. Falls die Datei nicht existiert, wird ein neues Objekt mit Standardwerten zurückgegeben.
         """
-        assert os.path.isdir(location), f"Location {location} is not a directory"
         assert isinstance(eva_no, str), f"Eva number {eva_no} is not a string"
 
-        stats_file = os.path.join(location, str(eva_no), "_stats.json")
-        if not os.path.isfile(stats_file):
+        stats_file = os.path.join(location, eva_no, "_stats.json")
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
             logging.info(msg=f"No stats file found for {eva_no}, returning default stats.")
             return TimetableCacheStationStats()
-        with open(stats_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            stats = TimetableCacheStationStats()
-            stats.change_count = data.get("change_count", 0)
-            return stats
+        stats = TimetableCacheStationStats()
+        stats.change_count = data.get("change_count", 0)
+        if data.get("planned_cache_end"):
+            stats.planned_cache_end = datetime.datetime.fromisoformat(data["planned_cache_end"])
+        return stats
+
+    @staticmethod
+    def save_station_stats(location: str, eva_no: str, stats: "TimetableCacheStationStats"):
+        """
+        Saves the station stats to the _stats.json file
+        """
+        assert isinstance(eva_no, str), f"Eva number {eva_no} is not a string"
+
+        eva_cache_dir = os.path.join(location, eva_no)
+        os.makedirs(eva_cache_dir, exist_ok=True)
+        data = {
+            "change_count": stats.change_count,
+            "planned_cache_end": stats.planned_cache_end.isoformat() if stats.planned_cache_end else None,
+        }
+        # replaced atomically, a concurrent load_station_stats never reads a truncated file
+        stats_file = os.path.join(eva_cache_dir, "_stats.json")
+        tmp_file = f"{stats_file}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, stats_file)
 
 
 class TimetableCacheStationStats:
 
     def __init__(self):
         self.change_count = 0
+        # start of the newest planned hour bucket written to disk
+        self.planned_cache_end: Union[datetime.datetime, None] = None
 
 
 class TimetableCacheMessage:
@@ -248,9 +546,60 @@ class TimetableCacheMessage:
         self.count += 1
 
 
+def _fdatasync(fd: int):
+    # fdatasync is not available on every platform (e.g. macOS)
+    getattr(os, "fdatasync", os.fsync)(fd)
+
+
+def _fsync_dir(path: str):
+    # makes renames into the directory durable; directories cannot be opened for fsync on Windows
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def format_cache_day(date: datetime.datetime) -> str:
+    """
+    Formats the YYYYMMDD name of a day directory with integer formatting instead of strftime
+    """
+    return f"{date.year:04d}{date.month:02d}{date.day:02d}"
+
+
+def cache_hour_dir(eva_dir: str, date: datetime.datetime) -> str:
+    """
+    Returns the day directory of an hour bucket below an already joined location/eva_no directory
+    """
+    return f"{eva_dir}{os.sep}{date.year:04d}{date.month:02d}{date.day:02d}"
+
+
+def _build_cache_stops(data: list[dict]) -> tuple[list[TimetableCacheStop], dict[str, TimetableCacheStop]]:
+    """
+    Builds the TimetableCacheStop list of a stored hour bucket
+    :return: the stops and the stops indexed by their planned stop id
+    """
+    stops = []
+    stops_by_id = {}
+    for stop_dict in data:
+        planned = TimetableStop(**stop_dict.get("timetable_planned")) if stop_dict.get(
+            "timetable_planned") else None
+        changes = [TimetableStop(**c) for c in stop_dict.get("timetable_changes", [])]
+        stop = TimetableCacheStop(timetable_planned=planned, timetable_changes=changes)
+        stops.append(stop)
+        if planned:
+            stops_by_id[planned.id] = stop
+    return stops, stops_by_id
+
+
 def get_planned_time(stop: TimetableStop):
-    if stop.ar and hasattr(stop.ar, 'pt') and stop.ar.pt:
-        return stop.ar.pt
-    if stop.dp and hasattr(stop.dp, 'pt') and stop.dp.pt:
-        return stop.dp.pt
+    # pt is a declared field of Event, so no hasattr probes are needed
+    ar = stop.ar
+    if ar is not None and ar.pt:
+        return ar.pt
+    dp = stop.dp
+    if dp is not None and dp.pt:
+        return dp.pt
     return None
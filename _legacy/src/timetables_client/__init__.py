@@ -7,6 +7,7 @@ __all__ = [
     "TimetablesClient",
     "format_db_date",
     "format_db_hour",
+    "parse_db_time",
     # Models
     "BaseModelWithConfig",
     "DistributorMessage",
@@ -6,23 +6,29 @@ def format_db_date(dt: datetime) -> str:
     return dt.strftime("%y%m%d")
 
 
+# DB API HH strings indexed by hour, for loops over hours of one day
+DB_HOURS = tuple(f"{hour:02d}" for hour in range(24))
+
+
 def format_db_hour(dt: datetime) -> str:
     """Convert datetime to DB API HH format (24h)."""
     v = dt.strftime("%H")
     return v
 
 
+def parse_db_time(value: str) -> datetime:
+    """Convert DB API YYMMddHHmm timestamp to datetime (fixed-width, no strptime)."""
+    return datetime(2000 + int(value[0:2]), int(value[2:4]), int(value[4:6]), int(value[6:8]), int(value[8:10]))
+
+
 def split_stop_id(stop_id: str) -> tuple[str, datetime, str]:
     """
     separates a stop id into: start date, number of stop in trip, daily trip id
     :param stop_id: the stop id to split
     :return: tuple of (number of stop in trip, daily trip id)
     """
-    train_id = stop_id.rsplit('-', 2)[0]
-    date = stop_id.rsplit('-', 2)[1]
-    date = datetime.strptime(date, "%y%m%d%H%M")
-    stop_number = stop_id.rsplit('-', 2)[2]
-    return train_id, date, stop_number
+    train_id, date, stop_number = stop_id.rsplit('-', 2)
+    return train_id, parse_db_time(date), stop_number
 
 
 if __name__ == "__main__":
@@ -34,6 +40,8 @@ if __name__ == "__main__":
     print(format_db_hour(datetime(2024, 1, 1, 5, 0, 0)))
     print(format_db_hour(datetime(2024, 1, 1, 0, 1, 0)))
 
+    assert parse_db_time("2509010034") == datetime(year=2025, month=9, day=1, hour=0, minute=34)
+
     assert split_stop_id("-7874571842864554321-1403311221-11") == ("-7874571842864554321", datetime(year=2014, month=3, day=31, hour=12, minute=21), "11")
     assert split_stop_id("123-2401010000-1") == ("123", datetime(year=2024, month=1, day=1, hour=0, minute=0), "1")
     assert split_stop_id("-123-2401010000-101") == ("-123", datetime(year=2024, month=1, day=1, hour=0, minute=0), "101")
@@ -1,5 +1,5 @@
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 
 # ----------------------
 # Enums (as Literals)
@@ -77,20 +77,18 @@ TripType = Literal["p", "e", "z", "s", "h", "n"]
 # ----------------------
 
 class BaseModelWithConfig(BaseModel):
+    # shared by all models, so pydantic-core builds every validator with the same settings
+    model_config = ConfigDict(extra="ignore")
+
     def __str__(self):
         # just print attributes that are not None
-        attrs = []
-        for field, value in self.__dict__.items():
-            if value is not None:
-                attrs.append(f"{field}={value}")
-        return f"{self.__class__.__name__}({', '.join(attrs)})"
+        attrs = ", ".join(f"{field}={value}" for field, value in self.__dict__.items() if value is not None)
+        return f"{self.__class__.__name__}({attrs})"
 
     __repr__ = __str__
 
 
 class DistributorMessage(BaseModelWithConfig):
-    model_config = ConfigDict(extra="ignore")
-
     int: Optional[str] = None
     """ internal text """
     n: Optional[str] = None
@@ -105,8 +103,6 @@ class Message(BaseModelWithConfig):
     """
     A message that is associated with an event, a stop or a trip.
     """
-    model_config = ConfigDict(extra="ignore")
-
     c: Optional[str] = None
     """ message code"""
     cat: Optional[str] = None
@@ -145,8 +141,6 @@ class Event(BaseModelWithConfig):
     """
     An event (arrival or departure) that is part of a stop.
     """
-    model_config = ConfigDict(extra="ignore")
-
     cde: Optional[str] = None
     """ Changed distant endpoint. """
     clt: Optional[str] = None
@@ -192,8 +186,6 @@ class HistoricDelay(BaseModelWithConfig):
     """
     It's the history of all delay-messages for a stop. This element extends HistoricChange.
     """
-    model_config = ConfigDict(extra="ignore")
-
     ar: Optional[str] = None
     """ The arrival event. The time, in ten digit 'YYMMddHHmm' format, e.g. '1404011437' for 14:37 on April the 1st of 2014. """
     cod: Optional[str] = None
@@ -210,8 +202,6 @@ class HistoricPlatformChange(BaseModelWithConfig):
     """
     It's the history of all platform-changes for a stop. This element extends HistoricChange.
     """
-    model_config = ConfigDict(extra="ignore")
-
     ar: Optional[str] = None
     """ Arrival platform. """
     cot: Optional[str] = None
@@ -227,8 +217,6 @@ class TripLabel(BaseModelWithConfig):
     It's a compound data type that contains common data items that characterize a Trip.
     The contents is represented as a compact 6-tuple in XML.
     """
-    model_config = ConfigDict(extra="ignore")
-
     c: str
     """ Category. Trip category, e.g. "ICE" or "RE """
     n: str
@@ -246,8 +234,6 @@ class ReferenceTripLabel(BaseModelWithConfig):
     It's a compound data type that contains common data items that characterize a reference trip. The con-tents is represented as a compact 3-tuple in XML.
     """
 
-    model_config = ConfigDict(extra="ignore")
-
     c: str
     """ Category. Trip category, e.g. "ICE" or "RE". """
     n: str
@@ -258,8 +244,6 @@ class ReferenceTripStopLabel(BaseModelWithConfig):
     """
     It's a compound data type that contains common data items that characterize a reference trip stop. The contents is represented as a compact 4-tuple in XML.
     """
-    model_config = ConfigDict(extra="ignore")
-
     eva: int
     """ The eva number of the correspondent stop of the regular trip. """
     i: int
@@ -274,8 +258,6 @@ class ReferenceTrip(BaseModelWithConfig):
     """
     A reference trip is another real trip, but it doesn't have its own stops and events. It refers only to its ref-erenced regular trip. The reference trip collects mainly all different attributes of the referenced regular trip.
     """
-    model_config = ConfigDict(extra="ignore")
-
     c: bool
     """ The cancellation flag. True means, the reference trip is cancelled. """
     ea: ReferenceTripStopLabel
@@ -299,8 +281,6 @@ class ReferenceTripRelation(BaseModelWithConfig):
     """
     A reference trip relation holds how a reference trip is related to a stop, for instance the reference trip starts after the stop. Stop contains a collection of that type, only if reference trips are available.
     """
-    model_config = ConfigDict(extra="ignore")
-
     rt: ReferenceTrip
     """ The reference trip. """
     rts: ReferenceTripRelationToStop
@@ -311,8 +291,6 @@ class TripReference(BaseModelWithConfig):
     """
     It's a reference to another trip, which holds its label and reference trips, if available.
     """
-    model_config = ConfigDict(extra="ignore")
-
     rt: Optional[List[TripLabel]] = None
     """ The referred trips reference trip elements. """
     tl: TripLabel
@@ -321,8 +299,6 @@ class TripReference(BaseModelWithConfig):
 
 class Connection(BaseModelWithConfig):
     """ It's information about a connected train at a particular stop. """
-    model_config = ConfigDict(extra="ignore")
-
     cs: ConnectionStatus
     """ Connection status. """
     eva: Optional[int] = None
@@ -341,8 +317,6 @@ class TimetableStop(BaseModelWithConfig):
     """
     A stop is a part of a Timetable.
     """
-    model_config = ConfigDict(extra="ignore")
-
     ar: Optional[Event] = None
     """ Arrival event. """
     conn: Optional[List[Connection]] = None
@@ -376,8 +350,6 @@ class StationData(BaseModelWithConfig):
     """
     A transport object which keep data for a station.
     """
-    model_config = ConfigDict(extra="ignore")
-
     ds100: str
     """ DS100 station code. """
     eva: int
@@ -394,8 +366,6 @@ class MultipleStationData(BaseModelWithConfig):
     """
     A wrapper that represents multiple StationData objects.
     """
-    model_config = ConfigDict(extra="ignore")
-
     station: List[StationData]
     """ List of stations. """
 
@@ -404,8 +374,6 @@ class Timetable(BaseModelWithConfig):
     """
     A timetable is made of a set of TimetableStops and a potential Disruption.
     """
-    model_config = ConfigDict(extra="ignore")
-
     eva: Optional[int] = None
     """ The eva code of the station for which this timetable is valid. Example '8000105' for Frankfurt(Main)Hbf. """
     m: Optional[List[Message]] = None
@@ -414,11 +382,14 @@ class Timetable(BaseModelWithConfig):
     """ The stops that are part of this timetable. """
     station: Optional[str] = None
     """ The name of the station for which this timetable is valid. Example 'Frankfurt(Main)Hbf' for Frankfurt(Main)Hbf. """
+    # (list, ids in that list, length of the list) of the last merge, see _merge_by_id
+    _message_ids: Optional[tuple] = PrivateAttr(default=None)
+    _stop_ids: Optional[tuple] = PrivateAttr(default=None)
 
     def __add__(self, other):
-        if self.eva is None and self == Timetable():
+        if self._is_empty():
             return other
-        if other.eva is None and other == Timetable():
+        if isinstance(other, Timetable) and other._is_empty():
             return self
 
         if isinstance(other, Timetable):
@@ -430,18 +401,34 @@ class Timetable(BaseModelWithConfig):
             if self.s is None:
                 self.s = []
             if other.m:
-                existing_message_ids = {msg.id for msg in self.m if msg.id is not None}
-                for msg in other.m:
-                    if msg.id not in existing_message_ids:
-                        self.m.append(msg)
+                self._merge_by_id(self.m, other.m, "_message_ids")
             if other.s:
-                existing_stop_ids = {stop.id for stop in self.s}
-                for stop in other.s:
-                    if stop.id not in existing_stop_ids:
-                        self.s.append(stop)
+                self._merge_by_id(self.s, other.s, "_stop_ids")
             return self
         return NotImplemented
 
+    def _is_empty(self) -> bool:
+        # plain attribute checks instead of comparing against a freshly validated Timetable()
+        return self.eva is None and not self.m and not self.s and self.station is None
+
+    def _merge_by_id(self, items: list, new_items: list, attr: str):
+        """
+        Appends the messages or stops of new_items whose id is not in items yet
+        The id set is kept in attr across merges, so chained additions (t1 + t2 + t3 ...) do not rebuild it,
+        and is only rebuilt when items was replaced or changed outside of __add__
+        """
+        cached = getattr(self, attr)
+        if cached is not None and cached[0] is items and cached[2] == len(items):
+            ids = cached[1]
+        else:
+            ids = {item.id for item in items if item.id is not None}
+        for item in new_items:
+            if item.id not in ids:
+                items.append(item)
+                if item.id is not None:
+                    ids.add(item.id)
+        setattr(self, attr, (items, ids, len(items)))
+
     def __eq__(self, other):
         if not isinstance(other, Timetable):
             return NotImplemented
@@ -1,11 +1,14 @@
-from typing import Any, Dict, Iterable
-import xmltodict
+import io
+import sys
+from typing import Any, Dict, Union
+
+from lxml import etree
 
 # ----------------------
-# Helpers for XML -> dict normalization
+# Field rules for XML -> dict normalization
 # ----------------------
 
-LIST_FIELDS = {
+LIST_FIELDS = frozenset({
     # Timetable
     ("timetable", "s"),                # list of TimetableStop
     ("timetable", "m"),                # list of Message
@@ -34,85 +37,86 @@ LIST_FIELDS = {
     ("dp", "wings"),                  # list of wing stations
     ("station", "meta"),              # list of meta tags (in StationData)
     ("station", "p"),                 # list of platforms (in StationData)
-}
+})
 
-PIPE_LIST_FIELDS = [
+PIPE_LIST_FIELDS = frozenset({
     "cpth",
     "ppth",
     "wings",
     "meta",
     "p"
-]
-
-def _strip_attr_prefix(obj: Any) -> Any:
-    """Recursively remove xmltodict attribute prefix '@' and collapse '#text'."""
-    if isinstance(obj, dict):
-        new: Dict[str, Any] = {}
-        for k, v in obj.items():
-            if k == "#text":
-                # prefer text as plain value when encountered
-                return _strip_attr_prefix(v)
-            key = k[1:] if k.startswith("@") else k
-            new[key] = _strip_attr_prefix(v)
-        return new
-    elif isinstance(obj, list):
-        return [_strip_attr_prefix(v) for v in obj]
-    else:
-        return obj
-
+})
 
-def _ensure_lists(node: Any, parent_key: str | None = None) -> Any:
-    """Recursively enforce LIST_FIELDS: certain children must always be lists."""
-    if isinstance(node, dict):
-        normalized = {}
-        for k, v in node.items():
-            v_norm = _ensure_lists(v, parent_key=k)
-            normalized[k] = v_norm
+# Interned copies for the hot lookups in parse(); element tags are interned as they come out of lxml,
+# so the tuple hashes and string compares mostly hit identical objects
+_LIST_FIELDS = frozenset((sys.intern(parent), sys.intern(child)) for parent, child in LIST_FIELDS)
+_PIPE_LIST_FIELDS = frozenset(sys.intern(field) for field in PIPE_LIST_FIELDS)
 
-            # If (parent_key, this_key) is in LIST_FIELDS -> enforce list
-            if (parent_key, k) in LIST_FIELDS:
-                if v_norm is None:
-                    normalized[k] = []
-                elif not isinstance(v_norm, list):
-                    normalized[k] = [v_norm]
-        return normalized
-    elif isinstance(node, list):
-        return [_ensure_lists(x, parent_key=parent_key) for x in node]
-    else:
-        return node
-
-
-def _split_pipe_fields(node: Any, fields: Iterable[str] = PIPE_LIST_FIELDS) -> Any:
-    """Recursively split pipe-separated station path fields into lists."""
-    if isinstance(node, dict):
-        new_node = {}
-        for k, v in node.items():
-            v = _split_pipe_fields(v)  # recurse first
-            if k in PIPE_LIST_FIELDS and isinstance(v, str):
-                new_node[k] = [s.strip() for s in v.split("|") if s.strip()]
+# LIST_FIELDS resolved per parent tag: parse() looks the child set up once when an element starts,
+# so inserting a child is a plain string lookup instead of building and hashing a (parent, child) tuple
+_LIST_CHILDREN: Dict[str, frozenset] = {
+    parent: frozenset(c for p, c in _LIST_FIELDS if p == parent) for parent, _ in _LIST_FIELDS
+}
+_NO_LIST_CHILDREN: frozenset = frozenset()
+
+# libxml2 options for the response parser: no entity resolution or id bookkeeping, and the indentation
+# between elements is dropped by the C parser instead of being handed to parse() and stripped there
+_PARSER_OPTIONS = dict(resolve_entities=False, collect_ids=False, huge_tree=False, remove_blank_text=True)
+
+
+def _split_pipe(value: str) -> list[str]:
+    """Split a pipe-separated station path field into a list."""
+    # one strip per segment; a regex split measured ~4x slower on typical ppth values
+    return [p for s in value.split("|") if (p := s.strip())]
+
+
+def parse(xml: Union[bytes, str]) -> Dict[str, Any]:
+    """
+    Parse an API response into a normalized dict in a single streaming pass.
+    Attributes become plain keys, text-only elements become their text, PIPE_LIST_FIELDS are split
+    and LIST_FIELDS are lists, decided when a child is inserted into its parent.
+    :param xml: raw response body; a str is accepted as well and parsed as UTF-8
+    """
+    # a str has already been decoded, so the encoding in its XML declaration no longer applies
+    encoding = "utf-8" if isinstance(xml, str) else None
+    source = io.BytesIO(xml.encode(encoding) if encoding else xml)
+    root: Dict[str, Any] = {}
+    # (tag, dict of the element under construction, its LIST_FIELDS children) for every open element
+    stack: list[tuple[Union[str, None], Dict[str, Any], frozenset]] = [(None, root, _NO_LIST_CHILDREN)]
+    for event, elem in etree.iterparse(source, events=("start", "end"), encoding=encoding, **_PARSER_OPTIONS):
+        if event == "start":
+            node = {}
+            for k, v in elem.attrib.items():
+                node[k] = _split_pipe(v) if k in _PIPE_LIST_FIELDS else v
+            tag = sys.intern(elem.tag)
+            stack.append((tag, node, _LIST_CHILDREN.get(tag, _NO_LIST_CHILDREN)))
+            continue
+
+        tag, node, _ = stack.pop()
+        text = elem.text.strip() if elem.text else None
+        if text:
+            # text content wins over attributes, as in the former xmltodict based parser
+            value = _split_pipe(text) if tag in _PIPE_LIST_FIELDS else text
+        else:
+            value = node or None
+        elem.clear()
+
+        _, parent, list_children = stack[-1]
+        if tag in list_children:
+            children = parent.setdefault(tag, [])
+            if value is not None:
+                children.append(value)
+        elif tag in parent:
+            # repeated element outside of LIST_FIELDS
+            existing = parent[tag]
+            if type(existing) is list:
+                existing.append(value)
             else:
-                new_node[k] = v
-        return new_node
-    elif isinstance(node, list):
-        return [_split_pipe_fields(x) for x in node]
-    else:
-        return node
-
-
-def normalize_xml_dict(d: Dict[str, Any]) -> Dict[str, Any]:
-    d = _strip_attr_prefix(d)
-    d = _split_pipe_fields(d)
-    d = _ensure_lists(d)
+                parent[tag] = [existing, value]
+        else:
+            parent[tag] = value
 
     # Handle empty timetable explicitly
-    if "timetable" in d and (d["timetable"] is None or d["timetable"] == {}):
-        d["timetable"] = {"s": []}
-
-    d = _ensure_lists(d)
-
-    return d
-
-
-def parse(xml: str) -> Dict[str, Any]:
-    parsed = xmltodict.parse(xml)
-    return normalize_xml_dict(parsed)
+    if "timetable" in root and not root["timetable"]:
+        root["timetable"] = {"s": []}
+    return root
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+import importlib.util
 from pathlib import Path
 from typing import Any, Dict, Union, overload
 import os
@@ -6,12 +8,21 @@ import httpx
 from dotenv import load_dotenv
 
 from .models import Timetable, MultipleStationData
-from .helpers import format_db_date, format_db_hour
+from .helpers import DB_HOURS, format_db_date, format_db_hour
 from .parse_xml import parse
 
+# Compiled pydantic-core validators, looked up once instead of through model_validate on every response
+_TIMETABLE_VALIDATOR = Timetable.__pydantic_validator__
+_STATIONS_VALIDATOR = MultipleStationData.__pydantic_validator__
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it the client stays on HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class TimetablesClient:
     BASE_URL = "https://apis.deutschebahn.com/db-api-marketplace/apis/timetables/v1"
+    # Concurrent hourly requests in get_planned_timetable_range
+    RANGE_FETCH_WORKERS = 8
 
     def __init__(self, env_path: str, *, timeout: float = 15.0):
         """
@@ -39,6 +50,8 @@ class TimetablesClient:
                 "Accept": "application/xml",
             },
             timeout=timeout,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60.0),
         )
 
     # -------------
@@ -72,7 +85,7 @@ class TimetablesClient:
         d = parse(self._get_planned_timetable_raw(eva_no=eva_no, day=day, hour=hour))
         # API root element is 'timetable'
         data = d.get("timetable", {})
-        d = Timetable.model_validate(data)
+        d = _TIMETABLE_VALIDATOR.validate_python(data)
         d.eva = eva_no
         return d
 
@@ -85,7 +98,7 @@ class TimetablesClient:
         """
         d = parse(self._get_full_changes_raw(eva_no=eva_no))
         data = d.get("timetable", {})
-        return Timetable.model_validate(data)
+        return _TIMETABLE_VALIDATOR.validate_python(data)
 
     def get_recent_changes(self, *, eva_no: Union[str, int]) -> Timetable:
         """
@@ -96,7 +109,7 @@ class TimetablesClient:
         """
         d = parse(self._get_recent_changes_raw(eva_no=eva_no))
         data = d.get("timetable", {})
-        return Timetable.model_validate(data)
+        return _TIMETABLE_VALIDATOR.validate_python(data)
 
     def search_station(self, *, pattern: str) -> MultipleStationData:
         """
@@ -113,30 +126,31 @@ class TimetablesClient:
             payload = {"station": stations or []}
         else:
             payload = {"station": d.get("station", []), }
-        return MultipleStationData.model_validate(payload)
+        return _STATIONS_VALIDATOR.validate_python(payload)
 
     # -------------
     # Debug get raw XML
     # -------------
-    def _get_planned_timetable_raw(self, *, eva_no: str, day: str, hour: str) -> str:
+    def _get_planned_timetable_raw(self, *, eva_no: str, day: str, hour: str) -> bytes:
         return self._get_xml(f"/plan/{eva_no}/{day}/{hour}")
 
-    def _get_full_changes_raw(self, *, eva_no: str) -> str:
+    def _get_full_changes_raw(self, *, eva_no: str) -> bytes:
         return self._get_xml(f"/fchg/{eva_no}")
 
-    def _get_recent_changes_raw(self, *, eva_no: str) -> str:
+    def _get_recent_changes_raw(self, *, eva_no: str) -> bytes:
         return self._get_xml(f"/fchg/{eva_no}")
 
-    def _search_station_raw(self, *, pattern: str) -> str:
+    def _search_station_raw(self, *, pattern: str) -> bytes:
         return self._get_xml(f"/station/{pattern}")
 
     # -------------
     # Low-level GET
     # -------------
-    def _get_xml(self, path: str) -> str:
+    def _get_xml(self, path: str) -> bytes:
         resp = self._session.get(path)
         resp.raise_for_status()
-        return resp.text
+        # raw body, the parser detects the encoding from the XML declaration without a decode + re-encode here
+        return resp.content
 
     # -------------
     # Higher-level convenience
@@ -157,7 +171,7 @@ class TimetablesClient:
         if end < start:
             raise ValueError("end must be after start")
 
-        timetable = Timetable()
+        hours = []
         current = start.replace(minute=0, second=0, microsecond=0)
         while current.date() <= end.date():
             if current.date() == start.date():
@@ -168,15 +182,19 @@ class TimetablesClient:
                 hour_end = end.hour
             else:
                 hour_end = 23
-            for hour in range(hour_start, hour_end + 1):
-                dt = current.replace(hour=hour)
-                timetable += self.get_planned_timetable(
-                    eva_no=eva_no,
-                    day=format_db_date(dt),
-                    hour=format_db_hour(dt),
-                )
+            day = format_db_date(current)
+            hours.extend((day, DB_HOURS[hour]) for hour in range(hour_start, hour_end + 1))
             current += datetime.timedelta(days=1)
             current = current.replace(hour=0)
+
+        # the hourly requests are independent, run them on the pooled session concurrently and merge in order
+        with ThreadPoolExecutor(max_workers=self.RANGE_FETCH_WORKERS) as executor:
+            parts = list(executor.map(
+                lambda day_hour: self.get_planned_timetable(eva_no=eva_no, day=day_hour[0], hour=day_hour[1]),
+                hours))
+        timetable = Timetable()
+        for part in parts:
+            timetable += part
         return timetable
 
     # -------------
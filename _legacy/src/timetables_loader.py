@@ -54,10 +54,12 @@ class TimetablesLoader:
 
         except KeyboardInterrupt:
             logger.info(msg="Stopping TimetablesLoader")
+            self.timetable.flush()
             self.client.close()
             logger.info(msg="TimetablesLoader stopped")
         except Exception as e:
             logger.error(msg=f"Error in TimetablesLoader: {e}")
+            self.timetable.flush()
             self.client.close()
             logger.info(msg="TimetablesLoader stopped due to error")
 
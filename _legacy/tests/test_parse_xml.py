@@ -0,0 +1,117 @@
+import os
+from typing import Any
+
+import pytest
+
+from src.timetables_client import MultipleStationData, Timetable
+from src.timetables_client.parse_xml import LIST_FIELDS, PIPE_LIST_FIELDS, parse
+
+SAMPLE_RESPONSE = os.path.join(os.path.dirname(__file__), "..", "response_schema", "bahn_api_sample_response.xml")
+
+PLANNED = """<?xml version='1.0' encoding='UTF-8'?>
+<timetable station="Köln Hbf">
+<s id="-123-2508261235-1"><tl f="F" t="p" o="80" c="ICE" n="123"/><ar pt="2508261625" pp="5" l="1" ppth="A|B | C||"/><dp pt="2508261630" pp="5" ppth="D"/></s>
+<s id="-124-2508261235-1"><tl f="F" t="p" o="80" c="ICE" n="124"/><dp pt="2508261730" pp="6" ppth="" wings="x|y"/>
+<m id="m1" t="h" ts="2508261730"><dm n="a" t="s"/><tl c="RE" n="1" o="8"/></m>
+<ref><tl c="RE" n="2" o="8"/><rt c="S" n="3" o="8"/><rt c="S" n="4" o="8"/></ref>
+<conn cs="w" id="c1" ts="2508261730"><s id="-1-2-3"><tl c="RB" n="5" o="8"/></s></conn>
+<hd ar="2508261730" src="L"/><hd ar="2508261731" src="A"/>
+</s>
+<m id="g" t="r" ts="2508261730"/>
+</timetable>""".encode()
+
+SAMPLES = {
+    "empty": b"<timetable/>",
+    "empty_with_attributes": b'<timetable station="X" eva="1"/>',
+    "planned": PLANNED,
+    "stations": b'<stations><station p="1|2|3" meta="8000001" name="A" eva="8000105" ds100="FF" db="true" creationts="x"/></stations>',
+    "two_stations": b'<stations><station p="1" name="A" eva="1" ds100="FF"/><station name="B" eva="2" ds100="FG" meta="1|2"/></stations>',
+    "text": b'<timetable><s id="1-2-3"><ar pt="2508261625">txt</ar></s></timetable>',
+}
+with open(SAMPLE_RESPONSE, "rb") as _f:
+    SAMPLES["sample_response"] = _f.read()
+
+
+def _reference_parse(xml: bytes) -> dict[str, Any]:
+    """The xmltodict based normalization parse() replaced"""
+    xmltodict = pytest.importorskip("xmltodict")
+
+    def strip_attr_prefix(obj):
+        if isinstance(obj, dict):
+            new = {}
+            for k, v in obj.items():
+                if k == "#text":
+                    return strip_attr_prefix(v)
+                new[k[1:] if k.startswith("@") else k] = strip_attr_prefix(v)
+            return new
+        if isinstance(obj, list):
+            return [strip_attr_prefix(v) for v in obj]
+        return obj
+
+    def split_pipe_fields(node):
+        if isinstance(node, dict):
+            new = {}
+            for k, v in node.items():
+                v = split_pipe_fields(v)
+                new[k] = [s.strip() for s in v.split("|") if s.strip()] if k in PIPE_LIST_FIELDS and isinstance(v, str) else v
+            return new
+        if isinstance(node, list):
+            return [split_pipe_fields(x) for x in node]
+        return node
+
+    def ensure_lists(node, parent_key=None):
+        if isinstance(node, dict):
+            normalized = {}
+            for k, v in node.items():
+                normalized[k] = v = ensure_lists(v, parent_key=k)
+                if (parent_key, k) in LIST_FIELDS:
+                    if v is None:
+                        normalized[k] = []
+                    elif not isinstance(v, list):
+                        normalized[k] = [v]
+            return normalized
+        if isinstance(node, list):
+            return [ensure_lists(x, parent_key=parent_key) for x in node]
+        return node
+
+    d = ensure_lists(split_pipe_fields(strip_attr_prefix(xmltodict.parse(xml))))
+    if "timetable" in d and (d["timetable"] is None or d["timetable"] == {}):
+        d["timetable"] = {"s": []}
+    return ensure_lists(d)
+
+
+@pytest.mark.parametrize("name", sorted(SAMPLES))
+def test_parse_matches_reference(name):
+    xml = SAMPLES[name]
+    expected = _reference_parse(xml)
+    assert parse(xml) == expected
+    # an already decoded body parses the same, whatever encoding its declaration names
+    assert parse(xml.decode("utf-8")) == expected
+
+
+def test_parse_normalizes_lists_and_pipe_fields():
+    timetable = parse(PLANNED)["timetable"]
+    first, second = timetable["s"]
+    assert timetable["station"] == "Köln Hbf"
+    assert first["ar"]["ppth"] == ["A", "B", "C"]
+    assert first["dp"]["ppth"] == ["D"]
+    assert second["dp"]["wings"] == ["x", "y"]
+    assert second["dp"]["ppth"] == []
+    assert second["m"][0]["dm"] == [{"n": "a", "t": "s"}]
+    assert second["m"][0]["tl"] == [{"c": "RE", "n": "1", "o": "8"}]
+    assert second["ref"]["rt"] == [{"c": "S", "n": "3", "o": "8"}, {"c": "S", "n": "4", "o": "8"}]
+    assert second["conn"][0]["s"]["id"] == "-1-2-3"
+    assert [hd["src"] for hd in second["hd"]] == ["L", "A"]
+    assert timetable["m"] == [{"id": "g", "t": "r", "ts": "2508261730"}]
+
+
+def test_parse_empty_timetable():
+    assert parse(b"<timetable/>") == {"timetable": {"s": []}}
+    assert parse(b'<timetable station="X" eva="1"/>') == {"timetable": {"station": "X", "eva": "1"}}
+
+
+def test_parse_result_validates():
+    assert len(Timetable(**parse(SAMPLES["sample_response"])["timetable"]).s) > 0
+    stations = MultipleStationData(**parse(SAMPLES["two_stations"])["stations"]).station
+    assert [s.p for s in stations] == [["1"], None]
+    assert stations[1].meta == ["1", "2"]
@@ -0,0 +1,99 @@
+import datetime
+import json
+import os
+
+import msgpack
+
+from src.timetable_cache import TimetableCache
+from src.timetables_client import Event, Timetable, TimetableStop
+
+EVA = 8002549
+
+
+def _stop(stop_id: str, pt: str, **dp) -> TimetableStop:
+    return TimetableStop(id=stop_id, dp=Event(pt=pt, **dp))
+
+
+def _hour_file(location, date: datetime.datetime, suffix: str = "msgpack") -> str:
+    return os.path.join(location, str(EVA), date.strftime("%Y%m%d"), f"{date.hour}.{suffix}")
+
+
+def test_planned_round_trip_advances_watermark(tmp_path):
+    cache = TimetableCache(location=str(tmp_path))
+    cache.add_timetable_planned(Timetable(eva=EVA, s=[
+        _stop("1-2509011005-1", "2509011005", pp="5"),
+        _stop("2-2509011120-1", "2509011120", pp="6"),
+    ]))
+    # not flushed yet, the pending buckets count towards the cache end already
+    assert cache.get_planned_cache_time_end(EVA) == datetime.datetime(2025, 9, 1, 11)
+    cache.flush()
+
+    assert os.path.isfile(_hour_file(tmp_path, datetime.datetime(2025, 9, 1, 10)))
+    with open(os.path.join(tmp_path, str(EVA), "_stats.json"), encoding="utf-8") as f:
+        assert json.load(f)["planned_cache_end"] == "2025-09-01T11:00:00"
+    assert TimetableCache(location=str(tmp_path)).get_planned_cache_time_end(EVA) == datetime.datetime(2025, 9, 1, 11)
+
+    stops = TimetableCache.load_cached_stops(str(tmp_path), str(EVA), datetime.datetime(2025, 9, 1, 10))
+    assert [s.timetable_planned for s in stops] == [_stop("1-2509011005-1", "2509011005", pp="5")]
+    assert stops[0].timetable_changes == []
+
+
+def test_watermark_only_moves_forward(tmp_path):
+    cache = TimetableCache(location=str(tmp_path))
+    cache.add_timetable_planned(Timetable(eva=EVA, s=[_stop("1-2509011805-1", "2509011805")]))
+    cache.flush()
+    cache.add_timetable_planned(Timetable(eva=EVA, s=[_stop("2-2509010905-1", "2509010905")]))
+    cache.flush()
+
+    stats = TimetableCache.load_station_stats(str(tmp_path), str(EVA))
+    assert stats.planned_cache_end == datetime.datetime(2025, 9, 1, 18)
+
+
+def test_changes_go_to_sidecar_and_attach_on_load(tmp_path):
+    date = datetime.datetime(2025, 9, 1, 10)
+    cache = TimetableCache(location=str(tmp_path))
+    cache.add_timetable_planned(Timetable(eva=EVA, s=[_stop("1-2509011005-1", "2509011005", pp="5")]))
+    cache.flush()
+    hour_file = _hour_file(tmp_path, date)
+    with open(hour_file, "rb") as f:
+        planned_bytes = f.read()
+
+    change = _stop("1-2509011005-1", "2509011005", ct="2509011012", cp="7")
+    cache.add_timetable_change(Timetable(eva=EVA, s=[change, _stop("9-2509011005-1", "2509011005", ct="2509011010")]))
+
+    # the hour file is left alone, the change is appended to its sidecar
+    with open(hour_file, "rb") as f:
+        assert f.read() == planned_bytes
+    with open(_hour_file(tmp_path, date, "changes.msgpack"), "rb") as f:
+        assert list(msgpack.Unpacker(f)) == [
+            {"id": change.id, "change": change.model_dump(mode="json", exclude_none=True)}]
+    assert TimetableCache.load_station_stats(str(tmp_path), str(EVA)).change_count == 1
+
+    stops = TimetableCache.load_cached_stops(str(tmp_path), str(EVA), date)
+    assert len(stops) == 1
+    assert stops[0].timetable_changes == [change]
+
+
+def test_json_hour_file_is_converted(tmp_path):
+    date = datetime.datetime(2025, 9, 1, 10)
+    planned = _stop("1-2509011005-1", "2509011005", pp="5", ppth=["A", "B"])
+    change = _stop("1-2509011005-1", "2509011005", ct="2509011015")
+    day_dir = os.path.join(tmp_path, str(EVA), "20250901")
+    os.makedirs(day_dir)
+    with open(os.path.join(day_dir, "10.json"), "w", encoding="utf-8") as f:
+        json.dump([{"timetable_planned": planned.model_dump(mode="json", exclude_none=True), "timetable_changes": []}], f)
+    with open(os.path.join(day_dir, "10.changes.jsonl"), "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": change.id, "change": change.model_dump(mode="json", exclude_none=True)}) + "\n")
+
+    # the former format is still found by the watermark scan
+    assert TimetableCache(location=str(tmp_path)).get_planned_cache_time_end(EVA) == date
+
+    stops = TimetableCache.load_cached_stops(str(tmp_path), str(EVA), date)
+    assert [s.timetable_planned for s in stops] == [planned]
+    assert stops[0].timetable_changes == [change]
+    assert sorted(os.listdir(day_dir)) == ["10.msgpack"]
+
+    # a second load reads the converted file
+    stops = TimetableCache.load_cached_stops(str(tmp_path), str(EVA), date)
+    assert [s.timetable_planned for s in stops] == [planned]
+    assert stops[0].timetable_changes == [change]
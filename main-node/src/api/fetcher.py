@@ -1,14 +1,21 @@
 """Dynamic fetcher for DB Timetables API — planned and change data."""
 import asyncio
+import io
 import structlog
-import xmltodict
-from datetime import datetime
-from httpx import AsyncClient
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from httpx import AsyncClient, Limits
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.future import select
 
 from ..config import settings
 from ..db.session import AsyncSessionLocal
 from ..db.models import Station, Trip, TimetableStop, PlannedEvent, ChangedEvent
+from ..exceptions import FetchError, retry_with_backoff
+from ..timeutil import parse_db_time
 
 log = structlog.get_logger(__name__)
 
@@ -19,154 +26,355 @@ HEADERS = {
     "Accept": "application/xml",
 }
 
-async def fetch_timetable(eva: int, date: str, hour: str, session):
-    url = f"{API_BASE}/plan/{eva}/{date}/{hour}"
-    async with AsyncClient(headers=HEADERS, timeout=20) as client:
-        r = await client.get(url)
+# API event element -> stored event_type
+EVENT_TYPES = {"ar": "arrival", "dp": "departure"}
+
+# Rows per multi-row change insert: 5 bound parameters each stays below SQLite's 999-variable limit on older builds
+CHANGE_INSERT_BATCH_SIZE = 150
+
+# One pooled client for all fetches, so requests to the API reuse kept-alive connections
+_client: AsyncClient | None = None
+
+async def get_client() -> AsyncClient:
+    """Return the shared API client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = AsyncClient(
+            base_url=API_BASE,
+            headers=HEADERS,
+            timeout=settings.TIMEOUT_SECONDS,
+            limits=Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _client
+
+async def close_client():
+    """Close the shared API client, fetch_all and fetch_future call it when they finish."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Upper bound for concurrent API requests when fanning out over stations
+_fetch_semaphore = asyncio.Semaphore(settings.MAX_API_CONCURRENCY)
+
+async def _limited(coro):
+    async with _fetch_semaphore:
+        return await coro
+
+async def _gather_fetches(coros):
+    """Run fetch coroutines concurrently; a failed fetch is logged and yields None like a non-200 response."""
+    results = await asyncio.gather(*(_limited(c) for c in coros), return_exceptions=True)
+    for i, result in enumerate(results):
+        if isinstance(result, Exception):
+            log.warning("fetch_failed", error=str(result))
+            results[i] = None
+    return results
+
+# Transient responses that are retried instead of dropping the payload until the next cycle
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 8.0
+
+@dataclass(slots=True)
+class EventRec:
+    """Planned (pt/pp) and changed (ct/cp/cs) attributes of an arrival or departure."""
+    pt: str | None = None
+    pp: str | None = None
+    ct: str | None = None
+    cp: str | None = None
+    cs: str | None = None
+
+@dataclass(slots=True)
+class StopRec:
+    """A timetable stop as parsed from the API: trip label and its arrival/departure events."""
+    id: str
+    cat: str | None = None
+    num: str | None = None
+    ar: EventRec | None = None
+    dp: EventRec | None = None
+
+def _event_rec(el) -> EventRec | None:
+    # an event element without attributes carries no data, same as a missing one
+    if el is None or not el.attrib:
+        return None
+    get = el.get
+    return EventRec(get("pt"), get("pp"), get("ct"), get("cp"), get("cs"))
+
+class _StopReader:
+    """Collects the top-level <s> elements of a timetable document from (start/end) parser events."""
+    __slots__ = ("stops", "_root", "_depth")
+
+    def __init__(self):
+        self.stops: list[StopRec] = []
+        self._root = None
+        self._depth = 0
+
+    def read(self, events):
+        for event, el in events:
+            if event == "start":
+                if self._root is None:
+                    self._root = el
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if self._depth == 1 and el.tag == "s":
+                tl = el.find("tl")
+                self.stops.append(StopRec(
+                    el.get("id"),
+                    tl.get("c") if tl is not None else None,
+                    tl.get("n") if tl is not None else None,
+                    _event_rec(el.find("ar")),
+                    _event_rec(el.find("dp")),
+                ))
+                # drop the processed stop from the tree to keep memory bounded
+                self._root.clear()
+
+def parse_stops(content: bytes) -> list[StopRec]:
+    """
+    Parse the top-level <s> elements of a timetable response into StopRec records
+    holding the attributes of the trip label and events.
+    Nested elements (messages, connection stops) are not materialized into the records.
+    """
+    reader = _StopReader()
+    reader.read(ET.iterparse(io.BytesIO(content), events=("start", "end")))
+    return reader.stops
+
+async def _raise_if_transient(url: str, r):
+    if r.status_code in RETRY_STATUS_CODES:
+        retry_after = r.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            # the server asked for a pause, wait for it (bounded) on top of the backoff delay
+            await asyncio.sleep(min(float(retry_after), MAX_RETRY_AFTER_SECONDS))
+        raise FetchError(f"GET {url} returned {r.status_code}")
+
+@retry_with_backoff(base_delay=0.5, max_delay=8.0, operation_name="api_get")
+async def _get(url: str):
+    """GET an API path, retrying transport errors and transient status codes with backoff."""
+    client = await get_client()
+    r = await client.get(url)
+    await _raise_if_transient(url, r)
+    return r
+
+# Size of the body chunks fed to the XML parser while a response is streamed in
+STREAM_CHUNK_SIZE = 65536
+
+@retry_with_backoff(base_delay=0.5, max_delay=8.0, operation_name="api_get")
+async def _get_stops(url: str) -> tuple[int, list[StopRec] | None]:
+    """
+    GET a timetable path and parse its stops while the body streams in, without buffering the whole response.
+    Returns the status code and the stops, None for a non-200 response. Retries like _get.
+    """
+    client = await get_client()
+    async with client.stream("GET", url) as r:
+        await _raise_if_transient(url, r)
         if r.status_code != 200:
-            log.warning("plan_fetch_failed", eva=eva, code=r.status_code)
-            return None
-        data = xmltodict.parse(r.text)
-        return data.get("timetable", {})
+            return r.status_code, None
+        parser = ET.XMLPullParser(events=("start", "end"))
+        reader = _StopReader()
+        async for chunk in r.aiter_bytes(STREAM_CHUNK_SIZE):
+            parser.feed(chunk)
+            reader.read(parser.read_events())
+        parser.close()
+        reader.read(parser.read_events())
+    return r.status_code, reader.stops
+
+async def fetch_timetable(eva: int, date: str, hour: str, session):
+    url = f"/plan/{eva}/{date}/{hour}"
+    code, stops = await _get_stops(url)
+    if stops is None:
+        log.warning("plan_fetch_failed", eva=eva, code=code)
+        return None
+    return stops
 
 async def fetch_changes(eva: int, session):
-    url = f"{API_BASE}/fchg/{eva}"
-    async with AsyncClient(headers=HEADERS, timeout=20) as client:
-        r = await client.get(url)
-        if r.status_code != 200:
-            log.warning("change_fetch_failed", eva=eva, code=r.status_code)
-            return None
-        data = xmltodict.parse(r.text)
-        return data.get("timetable", {})
+    url = f"/fchg/{eva}"
+    code, stops = await _get_stops(url)
+    if stops is None:
+        log.warning("change_fetch_failed", eva=eva, code=code)
+        return None
+    return stops
 
 async def fetch_recent_changes(eva: int, session):
     """Fetch recent changes (last ~2 minutes)."""
-    url = f"{API_BASE}/rchg/{eva}"
-    async with AsyncClient(headers=HEADERS, timeout=20) as client:
-        r = await client.get(url)
-        if r.status_code != 200:
-            log.warning("recent_change_fetch_failed", eva=eva, code=r.status_code)
-            return None
-        data = xmltodict.parse(r.text)
-        return data.get("timetable", {})
+    url = f"/rchg/{eva}"
+    code, stops = await _get_stops(url)
+    if stops is None:
+        log.warning("recent_change_fetch_failed", eva=eva, code=code)
+        return None
+    return stops
 
 async def fetch_station(pattern: str):
     """Fetch station data by ar DS100 or full Name"""
-    url = f"{API_BASE}/station/{pattern}"
-    async with AsyncClient(headers=HEADERS, timeout=20) as client:
-        r = await client.get(url)
-        if r.status_code != 200:
-            log.warning("station_fetch_failed", pattern=pattern, code=r.status_code)
-            return None
-        data = xmltodict.parse(r.text)
-        return data.get("stations", {}).get("station", [])
+    url = f"/station/{pattern}"
+    r = await _get(url)
+    if r.status_code != 200:
+        log.warning("station_fetch_failed", pattern=pattern, code=r.status_code)
+        return None
+    return [dict(el.attrib) for el in ET.fromstring(r.content).iter("station")]
+
+# eva -> stations.id, station rows are stable so the id is looked up once per process
+_station_ids: dict[int, int] = {}
+
+@event.listens_for(Station, "after_delete")
+def _forget_station_id(mapper, connection, target):
+    _station_ids.pop(target.eva, None)
+
+async def get_station_id(eva: int, session) -> int | None:
+    """Return the id of the station with the given EVA, None if it is not registered."""
+    station_id = _station_ids.get(eva)
+    if station_id is None:
+        station_id = (await session.execute(select(Station.id).where(Station.eva == eva))).scalar()
+        if station_id is not None:
+            _station_ids[eva] = station_id
+    return station_id
 
 async def process_plan_data(data, eva: int, session: AsyncSessionLocal):
     """
-    Process and store planned timetable data.
+    Process and store planned timetable data, a list of StopRec from parse_stops.
     """
     if not data:
         return 0
-    stops = data.get("s", [])
-    if isinstance(stops, dict):
-        stops = [stops]
+
+    # look up all trips and stops of the payload at once instead of two SELECTs per stop
+    trip_ids = {f"{stop.cat or ''}-{stop.num or ''}" for stop in data}
+    trips = {
+        trip.trip_id: trip
+        for trip in (await session.execute(select(Trip).where(Trip.trip_id.in_(trip_ids)))).scalars()
+    }
+    existing_stop_ids = set((await session.execute(
+        select(TimetableStop.stop_id).where(TimetableStop.stop_id.in_([stop.id for stop in data]))
+    )).scalars())
+
+    station_id = await get_station_id(eva, session)
 
     new_records = 0
-    for stop in stops:
-        stop_id = stop.get("id")
-        trip_label = stop.get("tl", {})
-        trip_id = f"{trip_label.get('c','')}-{trip_label.get('n','')}"
+    new_objects = []
+    for stop in data:
+        stop_id = stop.id
+        trip_id = f"{stop.cat or ''}-{stop.num or ''}"
 
         # Trip upsert
-        trip = (await session.execute(select(Trip).where(Trip.trip_id == trip_id))).scalar_one_or_none()
+        trip = trips.get(trip_id)
         if not trip:
-            trip = Trip(trip_id=trip_id, category=trip_label.get("c"), number=trip_label.get("n"))
-            session.add(trip)
+            trip = Trip(trip_id=trip_id, category=stop.cat, number=stop.num)
+            trips[trip_id] = trip
+            new_objects.append(trip)
 
         # Stop upsert
-        existing_stop = (await session.execute(select(TimetableStop).where(TimetableStop.stop_id == stop_id))).scalar_one_or_none()
-        if not existing_stop:
-            stop_obj = TimetableStop(stop_id=stop_id, eva=eva, trip=trip)
-            session.add(stop_obj)
+        if stop_id not in existing_stop_ids:
+            existing_stop_ids.add(stop_id)
+            stop_obj = TimetableStop(stop_id=stop_id, eva=eva, station_id=station_id, trip=trip)
+            new_objects.append(stop_obj)
             new_records += 1
 
             # Planned arrival/departure events
-            for ev_type in ["ar", "dp"]:
-                if ev := stop.get(ev_type):
+            for ev_type, event_type in EVENT_TYPES.items():
+                if ev := getattr(stop, ev_type):
                     pe = PlannedEvent(
                         stop=stop_obj,
-                        event_type="arrival" if ev_type == "ar" else "departure",
-                        planned_time=ev.get("pt"),
-                        planned_platform=ev.get("pp"),
+                        event_type=event_type,
+                        planned_time=parse_db_time(ev.pt) if ev.pt else None,
+                        planned_platform=ev.pp,
                     )
-                    session.add(pe)
+                    new_objects.append(pe)
 
+    session.add_all(new_objects)
     await session.commit()
     return new_records
 
 async def process_change_data(data, eva: int, session):
     if not data:
         return 0
-    stops = data.get("s", [])
-    if isinstance(stops, dict):
-        stops = [stops]
-
-    new_changes = 0
-    for stop in stops:
-        stop_id = stop.get("id")
-        db_stop = (await session.execute(select(TimetableStop).where(TimetableStop.stop_id == stop_id))).scalar_one_or_none()
+
+    db_stops = {
+        db_stop.stop_id: db_stop
+        for db_stop in (await session.execute(
+            select(TimetableStop).where(TimetableStop.stop_id.in_([stop.id for stop in data]))
+        )).scalars()
+    }
+
+    rows = []
+    for stop in data:
+        db_stop = db_stops.get(stop.id)
         if not db_stop:
             continue
 
-        for ev_type in ["ar", "dp"]:
-            ev = stop.get(ev_type)
+        for ev_type, event_type in EVENT_TYPES.items():
+            ev = getattr(stop, ev_type)
             if not ev:
                 continue
 
-            changed_event = ChangedEvent(
-                stop=db_stop,
-                event_type="arrival" if ev_type == "ar" else "departure",
-                changed_time=ev.get("ct"),
-                changed_platform=ev.get("cp"),
-                changed_status=ev.get("cs"),
-            )
-            try:
-                session.add(changed_event)
-                await session.commit()
-                new_changes += 1
-            except Exception:
-                await session.rollback()  # likely a duplicate
-    return new_changes
+            rows.append({
+                "stop_id": db_stop.id,
+                "event_type": event_type,
+                "changed_time": parse_db_time(ev.ct) if ev.ct else None,
+                "changed_platform": ev.cp,
+                "changed_status": ev.cs,
+            })
+    if not rows:
+        return 0
+
+    # multi-row inserts in batches and one commit per payload, duplicates are skipped by the dedup constraint
+    insert = sqlite_insert if session.bind.dialect.name == "sqlite" else pg_insert
+    inserted = 0
+    for i in range(0, len(rows), CHANGE_INSERT_BATCH_SIZE):
+        stmt = insert(ChangedEvent).values(rows[i:i + CHANGE_INSERT_BATCH_SIZE]).on_conflict_do_nothing(
+            index_elements=["stop_id", "event_type", "changed_time", "changed_platform", "changed_status"]
+        )
+        result = await session.execute(stmt)
+        inserted += result.rowcount
+    await session.commit()
+    return inserted
 
 async def fetch_all():
+    try:
+        await _fetch_all()
+    finally:
+        # the pooled client lives as long as one fetch run, so no connections outlive it
+        await close_client()
+
+async def _fetch_all():
     async with AsyncSessionLocal() as session:
         stations = (await session.execute(select(Station))).scalars().all()
+        _station_ids.update((station.eva, station.id) for station in stations)
         now = datetime.utcnow()
         date = now.strftime("%y%m%d")
         hour = now.strftime("%H")
 
-        for station in stations:
-            eva = station.eva
-            plan_data = await fetch_timetable(eva, date, hour, session)
-            changes_data = await fetch_changes(eva, session)
+        # fetch all stations concurrently, then store sequentially since the session is not concurrency safe
+        results = await _gather_fetches(
+            [fetch_timetable(station.eva, date, hour, session) for station in stations]
+            + [fetch_changes(station.eva, session) for station in stations]
+        )
+        plan_results, change_results = results[:len(stations)], results[len(stations):]
 
+        for station, plan_data, changes_data in zip(stations, plan_results, change_results):
+            eva = station.eva
             added_plans = await process_plan_data(plan_data, eva, session)
             added_changes = await process_change_data(changes_data, eva, session)
             log.info("fetch_cycle", eva=eva, added_plans=added_plans, added_changes=added_changes)
 
 
 async def fetch_future(lookahead_hours: int = 3):
+    try:
+        await _fetch_future(lookahead_hours)
+    finally:
+        await close_client()
+
+async def _fetch_future(lookahead_hours: int):
     async with AsyncSessionLocal() as session:
         stations = (await session.execute(select(Station))).scalars().all()
+        _station_ids.update((station.eva, station.id) for station in stations)
         now = datetime.utcnow()
 
+        jobs = []
         for hour_offset in range(lookahead_hours):
             future_time = now + timedelta(hours=hour_offset)
             date = future_time.strftime("%y%m%d")
             hour = future_time.strftime("%H")
+            jobs.extend((station.eva, date, hour) for station in stations)
 
-            for station in stations:
-                eva = station.eva
-                plan_data = await fetch_timetable(eva, date, hour, session)
-                added_plans = await process_plan_data(plan_data, eva, session)
-                log.info("future_fetch_cycle", eva=eva, hour=hour, added_plans=added_plans)
\ No newline at end of file
+        results = await _gather_fetches([fetch_timetable(eva, date, hour, session) for eva, date, hour in jobs])
+
+        for (eva, date, hour), plan_data in zip(jobs, results):
+            added_plans = await process_plan_data(plan_data, eva, session)
+            log.info("future_fetch_cycle", eva=eva, hour=hour, added_plans=added_plans)
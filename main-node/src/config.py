@@ -10,8 +10,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, model_validator
 from pathlib import Path
 from typing import Optional, List
+import functools
 import json
 
+
+@functools.lru_cache(maxsize=1)
+def _load_settings_json(settings_file: Path, mtime_ns: int) -> dict:
+    """Parse settings.json; cached per path and modification time, so an unchanged file is read only once."""
+    with open(settings_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class Settings(BaseSettings):
     # --- Sensitive data from .env ---
     DATABASE_URL: str = Field(
@@ -50,6 +59,28 @@ class Settings(BaseSettings):
         30,
         description="Timeout duration for API requests in seconds"
     )
+    MAX_API_CONCURRENCY: int = Field(
+        16,
+        description="API requests in flight at the same time across all stations"
+    )
+    MAX_CONCURRENT_PLAN_FETCHES: int = Field(
+        8,
+        description="Hourly /plan requests of one station fetched at the same time"
+    )
+    
+    # --- Database connection pool ---
+    DB_POOL_SIZE: int = Field(
+        20,
+        description="Connections kept open in the database pool"
+    )
+    DB_MAX_OVERFLOW: int = Field(
+        10,
+        description="Extra connections opened when the pool is exhausted"
+    )
+    DB_POOL_TIMEOUT: int = Field(
+        10,
+        description="Seconds to wait for a free pool connection before failing"
+    )
     
     # --- Logging ---
     LOG_LEVEL: str = Field("INFO", description="Logging level")
@@ -75,10 +106,14 @@ class Settings(BaseSettings):
         """Load non-sensitive settings from settings.json if it exists."""
         settings_file = self.SETTINGS_FILE_PATH
         
-        if settings_file.exists():
+        try:
+            mtime_ns = settings_file.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+
+        if mtime_ns is not None:
             try:
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
+                json_data = _load_settings_json(settings_file, mtime_ns)
                 
                 # Map JSON keys to Settings fields (if not already set by env vars)
                 json_mapping = {
@@ -88,6 +123,11 @@ class Settings(BaseSettings):
                     'fetch_interval_seconds': 'FETCH_INTERVAL_SECONDS',
                     'retry_attempts': 'RETRY_ATTEMPTS',
                     'timeout_seconds': 'TIMEOUT_SECONDS',
+                    'max_api_concurrency': 'MAX_API_CONCURRENCY',
+                    'max_concurrent_plan_fetches': 'MAX_CONCURRENT_PLAN_FETCHES',
+                    'db_pool_size': 'DB_POOL_SIZE',
+                    'db_max_overflow': 'DB_MAX_OVERFLOW',
+                    'db_pool_timeout': 'DB_POOL_TIMEOUT',
                     'log_level': 'LOG_LEVEL',
                     'log_file_path': 'LOG_FILE_PATH',
                 }
@@ -0,0 +1,21 @@
+"""Engine options shared by the async engines, free of import-time side effects."""
+from sqlalchemy.engine import make_url
+from ..config import settings
+
+
+def engine_options(db_url: str) -> dict:
+    """Pool and driver options shared by the async engines, sized from settings."""
+    url = make_url(db_url)
+    if url.get_backend_name() == "sqlite":
+        # single writer, the default pool fits
+        return {}
+    options = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    # read from the URL itself, get_driver_name() loads the dialect and fails for aliases such as postgres://
+    if url.drivername.partition("+")[2] == "asyncpg":
+        # JIT compilation only costs planning time for the small statements issued here
+        options["connect_args"] = {"server_settings": {"jit": "off", "application_name": "ledpanel"}}
+    return options
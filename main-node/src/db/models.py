@@ -52,7 +52,7 @@ class PlannedEvent(Base):
     id = Column(Integer, primary_key=True)
     stop_id = Column(Integer, ForeignKey("timetable_stops.id"))
     event_type = Column(String(10))  # arrival / departure
-    planned_time = Column(String)
+    planned_time = Column(DateTime)
     planned_platform = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -65,7 +65,7 @@ class ChangedEvent(Base):
     id = Column(Integer, primary_key=True)
     stop_id = Column(Integer, ForeignKey("timetable_stops.id"))
     event_type = Column(String(10))  # arrival / departure
-    changed_time = Column(String)
+    changed_time = Column(DateTime)
     changed_platform = Column(String)
     changed_status = Column(String)
     fetched_at = Column(DateTime, default=datetime.utcnow)
@@ -1,30 +1,75 @@
 """Async SQLAlchemy engine + session factory + database initialization."""
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
-from .models import Base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy import bindparam, event, inspect, text, update, String
+from .models import Base, PlannedEvent, ChangedEvent
+from .engine_opts import engine_options
 from ..config import settings
+from ..timeutil import parse_db_time
+
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # set to True for SQL debug logs
     future=True,
+    **engine_options(settings.DATABASE_URL),
 )
 
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _):
+        """WAL journal with synchronous=NORMAL: commits append to the WAL without an fsync each."""
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 # Session factory
-AsyncSessionLocal = sessionmaker(
-    bind=engine,
-    class_=AsyncSession,
+AsyncSessionLocal = async_sessionmaker(
+    engine,
     expire_on_commit=False,
     autoflush=False,
 )
 
 
 async def init_db():
-    """Initialize DB (WAL mode for SQLite + create tables)."""
+    """Initialize DB (create tables, SQLite connections are switched to WAL on connect)."""
     async with engine.begin() as conn:
-        # Enable Write-Ahead Logging in SQLite for better concurrency
-        await conn.execute(text("PRAGMA journal_mode=WAL;"))
         # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_convert_legacy_event_times)
+
+
+# Event time columns stored as the API's 'YYMMddHHmm' strings before they became DateTime
+LEGACY_TIME_COLUMNS = ((PlannedEvent.__table__, "planned_time"), (ChangedEvent.__table__, "changed_time"))
+
+
+def _convert_legacy_event_times(conn):
+    """Convert event times left in the former 'YYMMddHHmm' string format to DateTime."""
+    if conn.dialect.name == "postgresql":
+        # change the column type in place, constraints and indexes on the column are kept
+        columns = {table.name: inspect(conn).get_columns(table.name) for table, _ in LEGACY_TIME_COLUMNS}
+        for table, column in LEGACY_TIME_COLUMNS:
+            col_type = next(c["type"] for c in columns[table.name] if c["name"] == column)
+            if isinstance(col_type, String):
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {column} TYPE TIMESTAMP "
+                    f"USING to_timestamp(NULLIF({column}, ''), 'YYMMDDHH24MI')::timestamp"
+                ))
+        return
+
+    # SQLite keeps the declared column type, so rewrite the old values row by row
+    for table, column in LEGACY_TIME_COLUMNS:
+        legacy = conn.execute(text(
+            f"SELECT id, {column} FROM {table.name} WHERE {column} NOT LIKE '%-%'"
+        )).all()
+        if not legacy:
+            continue
+        conn.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values({column: bindparam("value")}),
+            [{"row_id": row_id, "value": parse_db_time(value) if value else None} for row_id, value in legacy],
+        )
\ No newline at end of file
@@ -4,10 +4,13 @@ Uses SQLAlchemy async ORM with PostgreSQL backend and connection pooling.
 Handles all database operations with retry logic.
 """
 
+import time
 from datetime import datetime, timedelta
 from typing import List, Optional, AsyncGenerator
 from contextlib import asynccontextmanager
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy import Column, Integer, String, DateTime
@@ -16,6 +19,7 @@ from .logger import setup_logger
 from .exceptions import DatabaseError, retry_with_backoff
 from .models import StationData, PlannedEvent, ChangedEvent
 from .config import settings
+from .db.engine_opts import engine_options
 
 logger = setup_logger(__name__)
 
@@ -83,7 +87,24 @@ class DBChangedEvent(Base):
     fetched_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    __table_args__ = (sa.Index("idx_eva_fetched", "eva", "fetched_at"),)
+    __table_args__ = (
+        # covers the (eva, fetched_at) range scan and the stop_id of the anti-join in get_delayed_trains_without_plan
+        sa.Index("idx_changed_eva_fetched_stop", "eva", "fetched_at", "stop_id"),
+        sa.Index("idx_changed_stop_id", "stop_id"),
+    )
+
+
+# Columns refreshed when a planned event is re-saved with a later planned time
+PLANNED_UPDATE_COLUMNS = (
+    "planned_time", "planned_platform", "planned_path", "wings", "planned_line",
+    "planned_destination", "category", "train_number", "operator", "hidden",
+)
+
+# From this many changed events on, PostgreSQL appends them through asyncpg COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+# Seconds a station found in the database is trusted without asking again
+STATION_EXISTS_TTL = 3600
 
 
 # ============================================================================
@@ -98,6 +119,9 @@ class DatabaseManager:
         self.db_url = settings.DATABASE_URL
         self._engine = None
         self._session_factory = None
+        self._insert = pg_insert
+        # eva -> monotonic time the station was last known to exist, stations are only ever added
+        self._station_seen: dict[int, float] = {}
     
     async def _ensure_initialized(self):
         """Lazily initialize engine and session factory on first use."""
@@ -108,10 +132,19 @@ class DatabaseManager:
             self._engine = create_async_engine(
                 db_url,
                 echo=False,
-                pool_size=20,
-                max_overflow=10,
                 pool_pre_ping=True,  # Verify connections before use
                 pool_recycle=3600,   # Recycle connections after 1 hour
+                # Rows per multi-row VALUES batch of bulk inserts, SQLAlchemy shrinks a batch further
+                # if it would exceed the dialect's bound parameter limit
+                insertmanyvalues_page_size=1000,
+                **engine_options(db_url),
+            )
+            if self._engine.dialect.name == "sqlite":
+                self._insert = sqlite_insert
+            # Rows per multi-row upsert: every column of a row can become a bound parameter, and the dialect's
+            # limit reflects the driver (999 on SQLite builds before 3.32)
+            self._upsert_batch_size = max(
+                1, self._engine.dialect.insertmanyvalues_max_parameters // len(DBPlannedEvent.__table__.columns)
             )
             
             self._session_factory = async_sessionmaker(
@@ -172,14 +205,20 @@ class DatabaseManager:
         Raises:
             DatabaseError: If query fails after retries
         """
+        if time.monotonic() - self._station_seen.get(eva, float("-inf")) < STATION_EXISTS_TTL:
+            return True
+
         try:
-            logger.debug(f"Checking if station {eva} exists in database")
+            logger.debug("Checking if station %s exists in database", eva)
             
             async with self.get_session() as session:
                 result = await session.execute(
-                    sa.select(DBStation).where(DBStation.eva == eva)
+                    sa.select(sa.exists().where(DBStation.eva == eva))
                 )
-                return result.scalars().first() is not None
+                exists = bool(result.scalar())
+            if exists:
+                self._station_seen[eva] = time.monotonic()
+            return exists
         
         except Exception as e:
             logger.error(f"Error checking station data: {e}")
@@ -200,7 +239,7 @@ class DatabaseManager:
             DatabaseError: If save fails after retries
         """
         try:
-            logger.debug(f"Saving station data for {station.name} (EVA {station.eva})")
+            logger.debug("Saving station data for %s (EVA %s)", station.name, station.eva)
             
             async with self.get_session() as session:
                 # Upsert: check if exists, update or insert
@@ -225,6 +264,7 @@ class DatabaseManager:
                     )
                     session.add(new_station)
             
+            self._station_seen[station.eva] = time.monotonic()
             return True
         
         except Exception as e:
@@ -253,18 +293,18 @@ class DatabaseManager:
             DatabaseError: If query fails after retries
         """
         try:
-            logger.debug(f"Checking planned events for station {eva} in interval")
+            logger.debug("Checking planned events for station %s in interval", eva)
             
             async with self.get_session() as session:
+                # EXISTS stops at the first matching row instead of counting the whole interval
                 result = await session.execute(
-                    sa.select(sa.func.count(DBPlannedEvent.id)).where(
+                    sa.select(sa.exists().where(
                         (DBPlannedEvent.eva == eva) &
                         (DBPlannedEvent.planned_time >= start_time) &
                         (DBPlannedEvent.planned_time <= end_time)
-                    )
+                    ))
                 )
-                count = result.scalar() or 0
-                return count > 0
+                return bool(result.scalar())
         
         except Exception as e:
             logger.error(f"Error checking planned events: {e}")
@@ -290,49 +330,43 @@ class DatabaseManager:
             if not events:
                 return 0
             
-            logger.debug(f"Saving {len(events)} planned events for station {eva}")
+            logger.debug("Saving %d planned events for station %s", len(events), eva)
             
+            # one row per stop_id, a later planned time is merged into it like the update of an existing row
+            rows = {}
+            for event in events:
+                row = {
+                    "stop_id": event.stop_id,
+                    "eva": eva,
+                    "event_type": event.event_type,
+                    "planned_time": event.planned_time,
+                    "planned_platform": event.planned_platform,
+                    "planned_path": getattr(event, 'planned_path', None),
+                    "wings": getattr(event, 'wings', None),
+                    "planned_line": getattr(event, 'planned_line', None),
+                    "planned_destination": getattr(event, 'planned_destination', None),
+                    "category": getattr(event, 'category', None),
+                    "train_number": getattr(event, 'train_number', None),
+                    "operator": getattr(event, 'operator', None),
+                    "hidden": getattr(event, 'hidden', None),
+                }
+                current = rows.get(event.stop_id)
+                if current is None:
+                    rows[event.stop_id] = row
+                elif event.planned_time > current["planned_time"]:
+                    current.update((name, row[name]) for name in PLANNED_UPDATE_COLUMNS)
+            rows = list(rows.values())
+
             async with self.get_session() as session:
-                for event in events:
-                    # Try to get existing
-                    result = await session.execute(
-                        sa.select(DBPlannedEvent).where(
-                            DBPlannedEvent.stop_id == event.stop_id
-                        )
+                # Upsert in bulk: existing rows are only updated if the new planned time is more recent
+                for i in range(0, len(rows), self._upsert_batch_size):
+                    stmt = self._insert(DBPlannedEvent).values(rows[i:i + self._upsert_batch_size])
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["stop_id"],
+                        set_={name: stmt.excluded[name] for name in PLANNED_UPDATE_COLUMNS},
+                        where=DBPlannedEvent.planned_time < stmt.excluded.planned_time,
                     )
-                    existing = result.scalars().first()
-                    
-                    if existing:
-                        # Update only if new time is more recent
-                        if event.planned_time > existing.planned_time:
-                            existing.planned_time = event.planned_time
-                            existing.planned_platform = event.planned_platform
-                            existing.planned_path = getattr(event, 'planned_path', None)
-                            existing.wings = getattr(event, 'wings', None)
-                            existing.planned_line = getattr(event, 'planned_line', None)
-                            existing.planned_destination = getattr(event, 'planned_destination', None)
-                            existing.category = getattr(event, 'category', None)
-                            existing.train_number = getattr(event, 'train_number', None)
-                            existing.operator = getattr(event, 'operator', None)
-                            existing.hidden = getattr(event, 'hidden', None)
-                    else:
-                        # Insert new
-                        db_event = DBPlannedEvent(
-                            stop_id=event.stop_id,
-                            eva=eva,
-                            event_type=event.event_type,
-                            planned_time=event.planned_time,
-                            planned_platform=event.planned_platform,
-                            planned_path=getattr(event, 'planned_path', None),
-                            wings=getattr(event, 'wings', None),
-                            planned_line=getattr(event, 'planned_line', None),
-                            planned_destination=getattr(event, 'planned_destination', None),
-                            category=getattr(event, 'category', None),
-                            train_number=getattr(event, 'train_number', None),
-                            operator=getattr(event, 'operator', None),
-                            hidden=getattr(event, 'hidden', None),
-                        )
-                        session.add(db_event)
+                    await session.execute(stmt)
             
             return len(events)
         
@@ -360,29 +394,45 @@ class DatabaseManager:
             if not events:
                 return 0
             
-            logger.debug(f"Saving {len(events)} changed events for station {eva}")
+            logger.debug("Saving %d changed events for station %s", len(events), eva)
             
+            now = datetime.utcnow()
+            # Always insert (don't deduplicate for real-time data)
+            rows = [
+                {
+                    "stop_id": event.stop_id,
+                    "eva": eva,
+                    "event_type": event.event_type,
+                    "changed_time": event.changed_time,
+                    "changed_platform": event.changed_platform,
+                    "changed_status": event.changed_status,
+                    "changed_path": getattr(event, 'changed_path', None),
+                    "changed_line": getattr(event, 'changed_line', None),
+                    "changed_destination": getattr(event, 'changed_destination', None),
+                    "category": getattr(event, 'category', None),
+                    "train_number": getattr(event, 'train_number', None),
+                    "operator": getattr(event, 'operator', None),
+                    "hidden": getattr(event, 'hidden', None),
+                    "wings": getattr(event, 'wings', None),
+                    "fetched_at": event.fetched_at or now,
+                    "created_at": now,
+                }
+                for event in events
+            ]
+
             async with self.get_session() as session:
-                for event in events:
-                    # Always insert (don't deduplicate for real-time data)
-                    db_event = DBChangedEvent(
-                        stop_id=event.stop_id,
-                        eva=eva,
-                        event_type=event.event_type,
-                        changed_time=event.changed_time,
-                        changed_platform=event.changed_platform,
-                        changed_path=getattr(event, 'changed_path', None),
-                        changed_line=getattr(event, 'changed_line', None),
-                        changed_destination=getattr(event, 'changed_destination', None),
-                        category=getattr(event, 'category', None),
-                        train_number=getattr(event, 'train_number', None),
-                        operator=getattr(event, 'operator', None),
-                        hidden=getattr(event, 'hidden', None),
-                        wings=getattr(event, 'wings', None),
-                        changed_status=event.changed_status,
-                        fetched_at=event.fetched_at or datetime.utcnow(),
+                if len(rows) >= COPY_THRESHOLD and self._engine.dialect.driver == "asyncpg":
+                    # COPY streams the rows in one go, column defaults are not applied so every column is set above
+                    connection = await session.connection()
+                    raw = await connection.get_raw_connection()
+                    columns = list(rows[0])
+                    await raw.driver_connection.copy_records_to_table(
+                        DBChangedEvent.__tablename__,
+                        records=[tuple(row.values()) for row in rows],
+                        columns=columns,
                     )
-                    session.add(db_event)
+                else:
+                    await session.execute(sa.insert(DBChangedEvent), rows)
             
             return len(events)
         
@@ -411,30 +461,27 @@ class DatabaseManager:
             DatabaseError: If query fails after retries
         """
         try:
-            logger.debug(f"Finding delayed trains without plan for station {eva}")
+            logger.debug("Finding delayed trains without plan for station %s", eva)
             
             cutoff_time = datetime.utcnow() - timedelta(hours=lookback_hours)
             
             async with self.get_session() as session:
-                # Find changed events without corresponding planned events
+                # Find changed events without corresponding planned events (LEFT JOIN ... IS NULL anti-join)
                 result = await session.execute(
-                    sa.select(DBChangedEvent.stop_id).distinct().where(
+                    sa.select(DBChangedEvent.stop_id).distinct()
+                    .outerjoin(DBPlannedEvent, DBPlannedEvent.stop_id == DBChangedEvent.stop_id)
+                    .where(
                         (DBChangedEvent.eva == eva) &
                         (DBChangedEvent.fetched_at >= cutoff_time) &
-                        ~sa.exists(
-                            sa.select(1).where(
-                                DBPlannedEvent.stop_id == DBChangedEvent.stop_id
-                            )
-                        )
+                        DBPlannedEvent.stop_id.is_(None)
                     )
                 )
-                
                 stop_ids = result.scalars().all()
                 
                 if stop_ids:
-                    logger.debug(f"Found {len(stop_ids)} delayed trains without plan")
+                    logger.debug("Found %d delayed trains without plan", len(stop_ids))
                 
-                return list(stop_ids)
+                return stop_ids
         
         except Exception as e:
             logger.error(f"Error getting delayed trains: {e}")
@@ -3,9 +3,11 @@ Exception classes and retry handler for the application.
 """
 
 import time
+import random
 import functools
 from typing import Callable, TypeVar, Any
 import asyncio
+from .config import settings
 from .logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -41,13 +43,14 @@ def track_error(operation_name: str) -> int:
     Track consecutive errors for a given operation.
     Returns the current error count.
     """
-    consecutive_errors[operation_name] = consecutive_errors.get(operation_name, 0) + 1
-    return consecutive_errors[operation_name]
+    count = consecutive_errors.get(operation_name, 0) + 1
+    consecutive_errors[operation_name] = count
+    return count
 
 
 def reset_error(operation_name: str) -> None:
     """Reset error counter for a successful operation."""
-    consecutive_errors[operation_name] = 0
+    consecutive_errors.pop(operation_name, None)
 
 
 F = TypeVar('F', bound=Callable[..., Any])
@@ -58,7 +61,8 @@ def retry_with_backoff(
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     backoff_factor: float = 2.0,
-    operation_name: str | None = None
+    operation_name: str | None = None,
+    jitter: bool = True
 ) -> Callable[[F], F]:
     """
     Decorator to retry a function with exponential backoff.
@@ -69,96 +73,66 @@ def retry_with_backoff(
         max_delay: Maximum delay between retries
         backoff_factor: Multiplier for exponential backoff
         operation_name: Name for logging/tracking (defaults to function name)
+        jitter: Randomize each delay between half and full length, so concurrent callers don't retry in lockstep
     
     Raises:
         RetryExhausted: When all retries are exhausted
     """
-    from .config import settings
-    
     max_retries = max_attempts or settings.RETRY_ATTEMPTS
     
     def decorator(func: F) -> F:
         op_name = operation_name or func.__name__
+        # delay after each failed attempt, fixed per decorated function
+        delays = [min(base_delay * backoff_factor ** i, max_delay) for i in range(max_retries)]
+
+        def _next_delay(attempt: int, e: Exception) -> float:
+            """Record a failed attempt; return the delay before the next one or raise RetryExhausted."""
+            error_count = track_error(op_name)
+
+            if attempt >= max_retries:
+                logger.error(
+                    f"Retry exhausted for '{op_name}' after {max_retries} attempts: {e}",
+                    exc_info=True
+                )
+
+                if error_count >= ERROR_ESCALATION_THRESHOLD:
+                    logger.critical(
+                        f"ESCALATION: '{op_name}' failed {error_count} times consecutively. "
+                        "Switching to 1-minute retry interval."
+                    )
+
+                raise RetryExhausted(
+                    f"Failed after {max_retries} attempts: {e}"
+                ) from e
+
+            actual_delay = delays[attempt - 1]
+            if jitter:
+                actual_delay = random.uniform(actual_delay * 0.5, actual_delay)
+            logger.warning(
+                f"Attempt {attempt}/{max_retries} for '{op_name}' failed: {e}. "
+                f"Retrying in {actual_delay:.1f}s..."
+            )
+            return actual_delay
 
         @functools.wraps(func)
         def _sync_wrapper(*args, **kwargs):
-            attempt = 0
-            delay = base_delay
-
-            while attempt < max_retries:
+            for attempt in range(1, max_retries + 1):
                 try:
                     result = func(*args, **kwargs)
                     reset_error(op_name)
                     return result
-
                 except Exception as e:
-                    attempt += 1
-                    error_count = track_error(op_name)
-
-                    if attempt >= max_retries:
-                        logger.error(
-                            f"Retry exhausted for '{op_name}' after {max_retries} attempts: {e}",
-                            exc_info=True
-                        )
-
-                        if error_count >= ERROR_ESCALATION_THRESHOLD:
-                            logger.critical(
-                                f"ESCALATION: '{op_name}' failed {error_count} times consecutively. "
-                                "Switching to 1-minute retry interval."
-                            )
-
-                        raise RetryExhausted(
-                            f"Failed after {max_retries} attempts: {e}"
-                        ) from e
-
-                    actual_delay = min(delay, max_delay)
-                    logger.warning(
-                        f"Attempt {attempt}/{max_retries} for '{op_name}' failed: {e}. "
-                        f"Retrying in {actual_delay:.1f}s..."
-                    )
-
-                    time.sleep(actual_delay)
-                    delay *= backoff_factor
+                    time.sleep(_next_delay(attempt, e))
 
         @functools.wraps(func)
         async def _async_wrapper(*args, **kwargs):
-            attempt = 0
-            delay = base_delay
-
-            while attempt < max_retries:
+            for attempt in range(1, max_retries + 1):
                 try:
                     result = await func(*args, **kwargs)
                     reset_error(op_name)
                     return result
-
                 except Exception as e:
-                    attempt += 1
-                    error_count = track_error(op_name)
-
-                    if attempt >= max_retries:
-                        logger.error(
-                            f"Retry exhausted for '{op_name}' after {max_retries} attempts: {e}",
-                            exc_info=True
-                        )
-
-                        if error_count >= ERROR_ESCALATION_THRESHOLD:
-                            logger.critical(
-                                f"ESCALATION: '{op_name}' failed {error_count} times consecutively. "
-                                "Switching to 1-minute retry interval."
-                            )
-
-                        raise RetryExhausted(
-                            f"Failed after {max_retries} attempts: {e}"
-                        ) from e
-
-                    actual_delay = min(delay, max_delay)
-                    logger.warning(
-                        f"Attempt {attempt}/{max_retries} for '{op_name}' failed: {e}. "
-                        f"Retrying in {actual_delay:.1f}s..."
-                    )
-
-                    await asyncio.sleep(actual_delay)
-                    delay *= backoff_factor
+                    await asyncio.sleep(_next_delay(attempt, e))
 
         # Return async wrapper if the function is a coroutine function
         if asyncio.iscoroutinefunction(func):
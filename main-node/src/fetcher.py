@@ -9,8 +9,16 @@ API Endpoints:
 - /fchg/{evaNo} - Fetch all known changes
 """
 
+import asyncio
+import importlib.util
+import io
+import time
 import httpx
-import xml.etree.ElementTree as ET
+try:
+    # lxml parses faster with the same fromstring/iterparse/iter/get API; the stdlib parser is the fallback
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from typing import List, Optional
 from urllib.parse import quote
@@ -19,37 +27,67 @@ from .logger import setup_logger
 from .exceptions import FetchError, retry_with_backoff
 from .models import StationData, PlannedEvent, ChangedEvent
 from .config import settings
+from .timeutil import parse_db_time
 
 logger = setup_logger(__name__)
 
 # Deutsche Bahn API constants
 DB_API_BASE_URL = "https://apis.deutschebahn.com/db-api-marketplace/apis/timetables/v1"
 
+# Station metadata changes on the scale of months; unknown EVAs are asked again after a few minutes
+STATION_CACHE_TTL = 24 * 3600
+STATION_NOT_FOUND_TTL = 5 * 60
 
-def parse_db_time(time_str: str) -> datetime:
+# A past or current hourly /plan slice that returned 404 is not requested again for this long;
+# upcoming hours are always asked again, DB publishes their plans over time
+EMPTY_PLAN_SLOT_TTL = 6 * 3600
+
+# Transient responses are retried by the fetch methods; a numeric Retry-After is waited for (bounded) first
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 8.0
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); without it the client stays on HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _iter_stops(xml_bytes: bytes):
     """
-    Parse Deutsche Bahn time format 'YYMMddHHmm' to datetime.
-    
-    Args:
-        time_str: Time in format like '2501181430' (18 Dec 2025 14:30)
-    
-    Returns:
-        datetime object
+    Incrementally parse a timetable response and yield its <s> (stop) elements.
+    Top-level stops are cleared from the tree once consumed, so memory stays at about one stop.
     """
-    if not time_str or len(time_str) < 10:
-        return datetime.now()
-    
-    # Format: YYMMddHHmm
-    yy = int(time_str[0:2])
-    mm = int(time_str[2:4])
-    dd = int(time_str[4:6])
-    hh = int(time_str[6:8])
-    minute = int(time_str[8:10])
-    
-    # Handle century (assume 20XX for now, adjust if needed)
-    year = 2000 + yy if yy < 50 else 1900 + yy
-    
-    return datetime(year, mm, dd, hh, minute)
+    root = None
+    depth = 0
+    for event, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if elem.tag == "s":
+            yield elem
+            if depth == 1:
+                root.clear()
+
+
+def _stop_children(stop):
+    """
+    Return the first tl, dp and ar children of a stop element, found in one pass over its children.
+    With lxml this is much cheaper than three find() calls, which go through the Python ElementPath engine.
+    """
+    tl = dp = ar = None
+    for child in stop:
+        tag = child.tag
+        if tag == "dp":
+            if dp is None:
+                dp = child
+        elif tag == "ar":
+            if ar is None:
+                ar = child
+        elif tag == "tl":
+            if tl is None:
+                tl = child
+    return tl, dp, ar
 
 
 class DataFetcher:
@@ -61,14 +99,48 @@ class DataFetcher:
         self.client_id = settings.DB_CLIENT_ID
         self.timeout = settings.TIMEOUT_SECONDS
         self.base_url = DB_API_BASE_URL
-    
-    def _get_headers(self) -> dict:
-        """Get headers with authentication for DB API."""
-        return {
+        # authentication headers for DB API, baked into the shared client
+        self._headers = {
             "DB-Api-Key": self.api_key,
             "DB-Client-Id": self.client_id,
             "Accept": "application/xml",
         }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._api_semaphore = asyncio.Semaphore(settings.MAX_API_CONCURRENCY)
+        # eva -> (monotonic fetch time, station or None if the API does not know the EVA)
+        self._station_cache: dict[int, tuple[float, Optional[StationData]]] = {}
+        # (eva, date, hour) -> monotonic time the /plan slice came back empty (404)
+        self._empty_plan_slots: dict[tuple[int, str, str], float] = {}
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared API client, created on first use so every request reuses pooled connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=self.timeout,
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+        return self._client
+    
+    async def _get(self, path: str) -> httpx.Response:
+        """GET an API path; the shared semaphore bounds requests in flight across all station monitors."""
+        async with self._api_semaphore:
+            client = await self._get_client()
+            response = await client.get(path)
+        if response.status_code in RETRY_STATUS_CODES:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                # the server asked for a pause, wait for it outside the semaphore before the caller retries
+                await asyncio.sleep(min(float(retry_after), MAX_RETRY_AFTER_SECONDS))
+        return response
+    
+    async def aclose(self) -> None:
+        """Close the shared API client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     @retry_with_backoff(operation_name="fetch_station_data")
     async def fetch_station_data(self, eva: int) -> StationData:
@@ -84,22 +156,29 @@ class DataFetcher:
         Raises:
             FetchError: If fetch fails after retries
         """
+        cached = self._station_cache.get(eva)
+        if cached is not None:
+            cached_at, station = cached
+            ttl = STATION_CACHE_TTL if station is not None else STATION_NOT_FOUND_TTL
+            if time.monotonic() - cached_at < ttl:
+                if station is None:
+                    raise FetchError(f"No station data found for EVA {eva}")
+                return station
+        
         try:
             logger.info(f"Fetching station data for EVA {eva}")
             
-            url = f"{self.base_url}/station/{eva}"
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                response.raise_for_status()
+            response = await self._get(f"/station/{eva}")
+            response.raise_for_status()
             
             # Parse XML response
-            root = ET.fromstring(response.text)
+            root = ET.fromstring(response.content)
             
             # Navigate to first station element
             # Response format: <multipleStationData><station.../></multipleStationData>
             station_elem = root.find(".//station")
             if station_elem is None:
+                self._station_cache[eva] = (time.monotonic(), None)
                 raise FetchError(f"No station data found for EVA {eva}")
             
             # Extract station data from attributes
@@ -110,10 +189,13 @@ class DataFetcher:
                 platforms=len(station_elem.get("p", "").split("|")) if station_elem.get("p") else 0,
             )
             
+            self._station_cache[eva] = (time.monotonic(), station)
             logger.debug(f"Successfully fetched station data: {station.name}")
             return station
             
         except httpx.HTTPError as e:
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+                self._station_cache[eva] = (time.monotonic(), None)
             logger.error(f"HTTP error fetching station data for {eva}: {e}")
             raise FetchError(f"HTTP error: {e}") from e
         except Exception as e:
@@ -144,103 +226,155 @@ class DataFetcher:
         Raises:
             FetchError: If fetch fails after retries
         """
-        events = []
-        
         try:
             logger.info(f"Fetching planned events for station {eva} ({start_time} - {end_time})")
             
-            # Generate hourly API calls for the interval
+            # Hourly slices of the interval, fetched concurrently and merged in order
+            slots = []
             current = start_time.replace(minute=0, second=0, microsecond=0)
-            
             while current <= end_time:
-                date_str = current.strftime("%y%m%d")  # YYMMdd format
-                hour_str = current.strftime("%H")       # HH format
-                
-                url = f"{self.base_url}/plan/{eva}/{date_str}/{hour_str}"
-                
-                try:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.get(url, headers=self._get_headers())
-                        response.raise_for_status()
-
-                    # Parse XML response
-                    root = ET.fromstring(response.text)
-                    
-                    # Extract events from timetable stops
-                    for stop in root.findall(".//s"):
-                        stop_eva = int(stop.get("eva", 0))
-                        stop_id = stop.get("id", "")
-                        tl = stop.find("tl")
-                        category = tl.get("c") if tl is not None else None
-                        train_number = tl.get("n") if tl is not None else None
-                        operator = tl.get("o") if tl is not None else None
-                        
-                        # Parse departure event
-                        dp_elem = stop.find("dp")
-                        if dp_elem is not None:
-                            pt = dp_elem.get("pt")
-                            if pt:
-                                    planned_path = dp_elem.get("ppth") or stop.get("ppth")
-                                    wings = dp_elem.get("wings") or stop.get("wings")
-                                    planned_line = dp_elem.get("l") or (f"{category} {train_number}" if category and train_number else None)
-                                    planned_destination = dp_elem.get("pde")
-                                    hidden = True if dp_elem.get("hi") == "1" else (False if dp_elem.get("hi") == "0" else None)
-                                    events.append(PlannedEvent(
-                                        stop_id=stop_id,
-                                        event_type="dep",
-                                        planned_time=parse_db_time(pt),
-                                        planned_platform=dp_elem.get("pp"),
-                                        planned_path=planned_path,
-                                        wings=wings,
-                                        planned_line=planned_line,
-                                        planned_destination=planned_destination,
-                                        category=category,
-                                        train_number=train_number,
-                                        operator=operator,
-                                        hidden=hidden,
-                                    ))
-                        
-                        # Parse arrival event
-                        ar_elem = stop.find("ar")
-                        if ar_elem is not None:
-                            pt = ar_elem.get("pt")
-                            if pt:
-                                planned_path = ar_elem.get("ppth") or stop.get("ppth")
-                                wings = ar_elem.get("wings") or stop.get("wings")
-                                planned_line = ar_elem.get("l") or (f"{category} {train_number}" if category and train_number else None)
-                                planned_destination = ar_elem.get("pde")
-                                hidden = True if ar_elem.get("hi") == "1" else (False if ar_elem.get("hi") == "0" else None)
-                                events.append(PlannedEvent(
-                                    stop_id=stop_id,
-                                    event_type="arr",
-                                    planned_time=parse_db_time(pt),
-                                    planned_platform=ar_elem.get("pp"),
-                                    planned_path=planned_path,
-                                    wings=wings,
-                                    planned_line=planned_line,
-                                    planned_destination=planned_destination,
-                                    category=category,
-                                    train_number=train_number,
-                                    operator=operator,
-                                    hidden=hidden,
-                                ))
-                
-                except httpx.HTTPStatusError as e:
-                    if e.response.status_code == 404:
-                        # No data for this hour, skip
-                        logger.debug(f"No planned data for {eva} on {date_str}:{hour_str}")
-                    else:
-                        logger.warning(f"HTTP error for hour {date_str}:{hour_str}: {e}")
-                
+                slots.append((f"{current.year % 100:02d}{current.month:02d}{current.day:02d}", f"{current.hour:02d}"))  # YYMMdd, HH
                 current += timedelta(hours=1)
             
+            # forget empty slots past their TTL, so the map stays bounded
+            now = time.monotonic()
+            self._empty_plan_slots = {
+                slot: empty_since for slot, empty_since in self._empty_plan_slots.items()
+                if now - empty_since < EMPTY_PLAN_SLOT_TTL
+            }
+            
+            # a failing slot cancels the others, so a retry of the whole interval never races orphaned fetches
+            semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_PLAN_FETCHES)
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(self._fetch_plan_slot(eva, date_str, hour_str, semaphore))
+                    for date_str, hour_str in slots
+                ]
+            
+            events = []
+            for task in tasks:
+                events.extend(task.result())
+            
             logger.debug(f"Fetched {len(events)} planned events for station {eva}")
             return events
             
         except Exception as e:
+            if isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]
             logger.error(f"Error fetching planned events: {e}")
             raise FetchError(f"Failed to fetch planned events: {e}") from e
     
+    async def _fetch_plan_slot(
+        self,
+        eva: int,
+        date_str: str,
+        hour_str: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[PlannedEvent]:
+        """
+        Fetch and parse one hourly /plan slice.
+        The XML is parsed in a worker thread, so parsing overlaps with the other slices still in flight.
+        
+        Returns:
+            Planned events of the hour, empty if the API has no data for it (or answered with an HTTP error)
+        """
+        slot = (eva, date_str, hour_str)
+        empty_since = self._empty_plan_slots.get(slot)
+        if empty_since is not None and time.monotonic() - empty_since < EMPTY_PLAN_SLOT_TTL:
+            return []
+        
+        try:
+            async with semaphore:
+                response = await self._get(f"/plan/{eva}/{date_str}/{hour_str}")
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in RETRY_STATUS_CODES:
+                # transient, fail the interval so fetch_planned_events retries instead of dropping the hour
+                raise
+            if e.response.status_code == 404:
+                # No data for this hour, skip
+                now = datetime.now()
+                if date_str + hour_str <= f"{now.year % 100:02d}{now.month:02d}{now.day:02d}{now.hour:02d}":
+                    self._empty_plan_slots[slot] = time.monotonic()
+                logger.debug(f"No planned data for {eva} on {date_str}:{hour_str}")
+            else:
+                logger.warning(f"HTTP error for hour {date_str}:{hour_str}: {e}")
+            return []
+        
+        return await asyncio.to_thread(self._parse_planned_xml, response.content)
+    
+    def _parse_planned_xml(self, xml_bytes: bytes) -> List[PlannedEvent]:
+        """
+        Parse planned events from a /plan XML response.
+        
+        Args:
+            xml_bytes: Raw XML response body, the parser decodes it according to the XML declaration
+        
+        Returns:
+            List of parsed PlannedEvent objects
+        """
+        events = []
+        root = ET.fromstring(xml_bytes)
+        
+        # Extract events from timetable stops
+        for stop in root.iter("s"):
+            stop_eva = int(stop.get("eva", 0))
+            stop_id = stop.get("id", "")
+            tl, dp_elem, ar_elem = _stop_children(stop)
+            category = tl.get("c") if tl is not None else None
+            train_number = tl.get("n") if tl is not None else None
+            operator = tl.get("o") if tl is not None else None
+
+            # Parse departure event
+            if dp_elem is not None:
+                pt = dp_elem.get("pt")
+                if pt:
+                    planned_path = dp_elem.get("ppth") or stop.get("ppth")
+                    wings = dp_elem.get("wings") or stop.get("wings")
+                    planned_line = dp_elem.get("l") or (f"{category} {train_number}" if category and train_number else None)
+                    planned_destination = dp_elem.get("pde")
+                    hidden = True if dp_elem.get("hi") == "1" else (False if dp_elem.get("hi") == "0" else None)
+                    events.append(PlannedEvent(
+                        stop_id=stop_id,
+                        event_type="dep",
+                        planned_time=parse_db_time(pt),
+                        planned_platform=dp_elem.get("pp"),
+                        planned_path=planned_path,
+                        wings=wings,
+                        planned_line=planned_line,
+                        planned_destination=planned_destination,
+                        category=category,
+                        train_number=train_number,
+                        operator=operator,
+                        hidden=hidden,
+                    ))
+
+            # Parse arrival event
+            if ar_elem is not None:
+                pt = ar_elem.get("pt")
+                if pt:
+                    planned_path = ar_elem.get("ppth") or stop.get("ppth")
+                    wings = ar_elem.get("wings") or stop.get("wings")
+                    planned_line = ar_elem.get("l") or (f"{category} {train_number}" if category and train_number else None)
+                    planned_destination = ar_elem.get("pde")
+                    hidden = True if ar_elem.get("hi") == "1" else (False if ar_elem.get("hi") == "0" else None)
+                    events.append(PlannedEvent(
+                        stop_id=stop_id,
+                        event_type="arr",
+                        planned_time=parse_db_time(pt),
+                        planned_platform=ar_elem.get("pp"),
+                        planned_path=planned_path,
+                        wings=wings,
+                        planned_line=planned_line,
+                        planned_destination=planned_destination,
+                        category=category,
+                        train_number=train_number,
+                        operator=operator,
+                        hidden=hidden,
+                    ))
+
+        return events
+    
     @retry_with_backoff(operation_name="fetch_recent_changes")
     async def fetch_recent_changes(
         self,
@@ -265,13 +399,10 @@ class DataFetcher:
         try:
             logger.debug(f"Fetching recent changes for station {eva}")
             
-            url = f"{self.base_url}/rchg/{eva}"
-
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                response.raise_for_status()
+            response = await self._get(f"/rchg/{eva}")
+            response.raise_for_status()
 
-            events = self._parse_changes_xml(response.text, eva)
+            events = self._parse_changes_xml(response.content, eva)
             
             if events:
                 logger.debug(f"Fetched {len(events)} recent changes for station {eva}")
@@ -306,13 +437,10 @@ class DataFetcher:
         try:
             logger.info(f"Fetching all changes for station {eva} on {date.date()}")
             
-            url = f"{self.base_url}/fchg/{eva}"
+            response = await self._get(f"/fchg/{eva}")
+            response.raise_for_status()
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self._get_headers())
-                response.raise_for_status()
-
-            events = self._parse_changes_xml(response.text, eva)
+            events = self._parse_changes_xml(response.content, eva)
             
             logger.debug(f"Fetched {len(events)} all changes for station {eva}")
             return events
@@ -324,30 +452,28 @@ class DataFetcher:
             logger.error(f"Error fetching all changes for day: {e}")
             raise FetchError(f"Failed to fetch all changes: {e}") from e
     
-    def _parse_changes_xml(self, xml_text: str, eva: int) -> List[ChangedEvent]:
+    def _parse_changes_xml(self, xml_bytes: bytes, eva: int) -> List[ChangedEvent]:
         """
         Parse changed events from XML response.
         
         Args:
-            xml_text: XML response body
+            xml_bytes: Raw XML response body, the parser decodes it according to the XML declaration
             eva: Station EVA for context
         
         Returns:
             List of parsed ChangedEvent objects
         """
         events = []
-        root = ET.fromstring(xml_text)
         
-        # Extract events from timetable stops
-        for stop in root.findall(".//s"):
+        # Extract events from timetable stops, streamed instead of building the whole tree
+        for stop in _iter_stops(xml_bytes):
             stop_id = stop.get("id", "")
-            tl = stop.find("tl")
+            tl, dp_elem, ar_elem = _stop_children(stop)
             category = tl.get("c") if tl is not None else None
             train_number = tl.get("n") if tl is not None else None
             operator = tl.get("o") if tl is not None else None
             
             # Parse departure changes
-            dp_elem = stop.find("dp")
             if dp_elem is not None:
                 ct = dp_elem.get("ct")  # Changed time
                 cs = dp_elem.get("cs")  # Changed status
@@ -374,7 +500,6 @@ class DataFetcher:
                     ))
             
             # Parse arrival changes
-            ar_elem = stop.find("ar")
             if ar_elem is not None:
                 ct = ar_elem.get("ct")
                 cs = ar_elem.get("cs")
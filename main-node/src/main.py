@@ -15,8 +15,8 @@ Flow:
 
 import asyncio
 import signal
-from contextlib import suppress
 import time
+from contextlib import suppress
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -38,36 +38,39 @@ logger = setup_logger(__name__)
 class StationMonitor:
     """Monitors a single station for timetable changes."""
     
-    def __init__(self, eva: int):
+    def __init__(self, eva: int, orchestrator: "ApplicationOrchestrator"):
         self.eva = eva
-        self.last_planned_fetch = None
-        self.last_changes_fetch = None
-        self.escalation_backoff_until = None
+        # intervals and windows are read from the orchestrator, not from settings on every check
+        self.orchestrator = orchestrator
+        # time.monotonic() timestamps: cheap to read and unaffected by wall-clock adjustments
+        self.last_planned_fetch: float | None = None
+        self.last_changes_fetch: float | None = None
+        self.escalation_backoff_until: float | None = None
     
     def should_fetch_planned_events(self) -> bool:
         """Check if it's time to fetch planned events (every 1 hour)."""
         if self.last_planned_fetch is None:
             return True
-        return (datetime.now() - self.last_planned_fetch) >= timedelta(seconds=settings.PLANNED_FETCH_INTERVAL_SECONDS)
+        return time.monotonic() - self.last_planned_fetch >= self.orchestrator.planned_fetch_interval
     
     def should_fetch_changes(self) -> bool:
         """Check if it's time to fetch recent changes (every 30 seconds)."""
         if self.last_changes_fetch is None:
             return True
-        return (datetime.now() - self.last_changes_fetch) >= timedelta(seconds=settings.FETCH_INTERVAL_SECONDS)
+        return time.monotonic() - self.last_changes_fetch >= self.orchestrator.fetch_interval
     
     def should_backoff(self) -> bool:
         """Check if we're in escalation backoff (1 min interval after 5 consecutive errors)."""
         if self.escalation_backoff_until is None:
             return False
-        if datetime.now() < self.escalation_backoff_until:
+        if time.monotonic() < self.escalation_backoff_until:
             return True
         self.escalation_backoff_until = None
         return False
     
     def trigger_escalation_backoff(self):
         """Trigger 1-minute backoff after too many errors."""
-        self.escalation_backoff_until = datetime.now() + timedelta(minutes=1)
+        self.escalation_backoff_until = time.monotonic() + 60
         logger.warning(f"Station {self.eva}: Entering 1-minute backoff due to repeated failures")
     
     async def initialize(self) -> bool:
@@ -87,8 +90,8 @@ class StationMonitor:
             
             # 2. Ensure planned events exist for the monitoring window
             now = datetime.now()
-            window_start = now - timedelta(hours=settings.LOOKBEHIND_HOURS)
-            window_end = now + timedelta(hours=settings.LOOKAHEAD_HOURS)
+            window_start = now - self.orchestrator.lookbehind
+            window_end = now + self.orchestrator.lookahead
             
             if not await db.has_planned_events_for_interval(self.eva, window_start, window_end):
                 logger.info(f"Station {self.eva}: Fetching planned events for interval")
@@ -124,7 +127,7 @@ class StationMonitor:
             
             changes = await fetcher.fetch_recent_changes(self.eva, minutes_back=2)
             await db.save_changed_events(self.eva, changes)
-            self.last_changes_fetch = datetime.now()
+            self.last_changes_fetch = time.monotonic()
             
             if changes:
                 logger.debug(f"Station {self.eva}: Fetched {len(changes)} recent changes")
@@ -143,11 +146,11 @@ class StationMonitor:
             
             now = datetime.now()
             window_start = now
-            window_end = now + timedelta(hours=settings.LOOKAHEAD_HOURS + 1)
+            window_end = now + self.orchestrator.planned_lookahead
             
             events = await fetcher.fetch_planned_events(self.eva, window_start, window_end)
             await db.save_planned_events(self.eva, events)
-            self.last_planned_fetch = datetime.now()
+            self.last_planned_fetch = time.monotonic()
             
             if events:
                 logger.debug(f"Station {self.eva}: Fetched {len(events)} planned events")
@@ -180,6 +183,12 @@ class ApplicationOrchestrator:
     def __init__(self):
         self.monitors: Dict[int, StationMonitor] = {}
         self.running = False
+        # settings used on every monitor cycle, bound once at startup
+        self.fetch_interval = settings.FETCH_INTERVAL_SECONDS
+        self.planned_fetch_interval = settings.PLANNED_FETCH_INTERVAL_SECONDS
+        self.lookbehind = timedelta(hours=settings.LOOKBEHIND_HOURS)
+        self.lookahead = timedelta(hours=settings.LOOKAHEAD_HOURS)
+        self.planned_lookahead = timedelta(hours=settings.LOOKAHEAD_HOURS + 1)
     
     async def initialize(self) -> bool:
         """
@@ -190,6 +199,11 @@ class ApplicationOrchestrator:
         """
         logger.info("=== Starting Application Initialization ===")
         
+        # 0. Fail fast without API credentials, instead of through the fetch retries
+        if not settings.DB_API_KEY or not settings.DB_CLIENT_ID:
+            logger.critical("DB_API_KEY or DB_CLIENT_ID is not set. Aborting.")
+            return False
+        
         # 1. Check database connectivity
         try:
             if not await db.check_connection():
@@ -202,7 +216,7 @@ class ApplicationOrchestrator:
         # 2. Initialize monitors for each station
         all_ok = True
         for eva in settings.STATIONS:
-            monitor = StationMonitor(eva)
+            monitor = StationMonitor(eva, self)
             self.monitors[eva] = monitor
             
             if not await monitor.initialize():
@@ -223,19 +237,20 @@ class ApplicationOrchestrator:
         logger.info("=== Starting Monitoring Loop ===")
         self.running = True
         
+        # the set of monitors is fixed after initialize()
+        monitors = tuple(self.monitors.values())
+        
         try:
             while self.running:
                 logger.debug("--- Monitoring cycle start ---")
                 
                 # Run all monitors concurrently
-                tasks = [
-                    monitor.monitor_cycle()
-                    for monitor in self.monitors.values()
-                ]
-                await asyncio.gather(*tasks, return_exceptions=True)
+                async with asyncio.TaskGroup() as tg:
+                    for monitor in monitors:
+                        tg.create_task(self._run_monitor_cycle(monitor))
                 
                 # Wait configured interval before next cycle
-                await asyncio.sleep(settings.FETCH_INTERVAL_SECONDS)
+                await asyncio.sleep(self.fetch_interval)
                 
         except KeyboardInterrupt:
             logger.info("Monitoring interrupted by user")
@@ -244,6 +259,14 @@ class ApplicationOrchestrator:
         finally:
             self.shutdown()
     
+    @staticmethod
+    async def _run_monitor_cycle(monitor: StationMonitor) -> None:
+        """Run one monitor cycle, logging unexpected errors so they don't cancel the other monitors."""
+        try:
+            await monitor.monitor_cycle()
+        except Exception as e:
+            logger.error(f"Station {monitor.eva}: Unexpected error in monitor cycle: {e}", exc_info=True)
+    
     def shutdown(self) -> None:
         """Graceful shutdown."""
         logger.info("=== Shutting Down ===")
@@ -254,6 +277,10 @@ class ApplicationOrchestrator:
         """Async shutdown: stop monitors and close DB connections."""
         logger.info("=== Async Shutdown Start ===")
         self.running = False
+        try:
+            await fetcher.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing API client during shutdown: {e}")
         try:
             await db.close()
         except Exception as e:
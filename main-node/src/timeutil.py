@@ -0,0 +1,38 @@
+"""
+Timestamp helpers shared by the API fetchers.
+"""
+
+import functools
+from datetime import datetime
+
+
+def parse_db_time(time_str: str) -> datetime:
+    """
+    Parse Deutsche Bahn time format 'YYMMddHHmm' to datetime.
+    
+    Args:
+        time_str: Time in format like '2501181430' (18 Dec 2025 14:30)
+    
+    Returns:
+        datetime object
+    """
+    if not time_str or len(time_str) < 10:
+        return datetime.now()
+    return _parse_db_timestamp(time_str)
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_db_timestamp(time_str: str) -> datetime:
+    # Timestamps repeat across events and polling cycles; datetimes are immutable, so cached ones are shared
+    # Format: YYMMddHHmm, two ASCII digits per field: value = 10 * c0 + c1 - 11 * ord("0")
+    b = time_str.encode("ascii")
+    yy = b[0] * 10 + b[1] - 528
+    mm = b[2] * 10 + b[3] - 528
+    dd = b[4] * 10 + b[5] - 528
+    hh = b[6] * 10 + b[7] - 528
+    minute = b[8] * 10 + b[9] - 528
+    
+    # Handle century (assume 20XX for now, adjust if needed)
+    year = 2000 + yy if yy < 50 else 1900 + yy
+    
+    return datetime(year, mm, dd, hh, minute)